@@ -0,0 +1,239 @@
+# 헤드리스 벤치마크
+#   python -m core.bench stage3 stage1 --frames 600 --out bench.json
+# SDL dummy 드라이버로 GameEngine 을 띄우고, 장면마다 정해진 입력(스크립트)을 넣으면서
+# FPS 제한 없이 N 프레임을 돌린 뒤 단계별(event/update/draw/flip) 시간을 출력한다.
+import os
+import sys
+import json
+import random
+import argparse
+import tempfile
+from time import perf_counter
+
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+os.environ.setdefault("SDL_AUDIODRIVER", "dummy")
+
+import numpy as np
+import pygame
+
+from core.engine import GameEngine
+from core.profiler import PHASES, text_cache_line
+from core.text import text_cache
+
+
+class HeldKeys(set):
+    # pygame.key.get_pressed() 대신 쓰는 눌린 키 목록 (키 코드로 인덱싱)
+    def __getitem__(self, key):
+        return key in self
+
+
+def click(pos):
+    return [pygame.event.Event(pygame.MOUSEBUTTONDOWN, pos=pos, button=1),
+            pygame.event.Event(pygame.MOUSEBUTTONUP, pos=pos, button=1)]
+
+
+def key(k, text=""):
+    return [pygame.event.Event(pygame.KEYDOWN, key=k, mod=0, unicode=text, scancode=0),
+            pygame.event.Event(pygame.KEYUP, key=k, mod=0, unicode=text, scancode=0)]
+
+
+# -------------------------------------------------------
+# 시나리오 : engine 을 받아 (장면, 스크립트) 를 돌려준다.
+# 스크립트는 (프레임 번호, 장면, 눌린 키) 를 받아 이번 프레임에 넣을 이벤트 리스트를 돌려준다.
+# -------------------------------------------------------
+SCENARIOS = {}
+
+
+def scenario(name):
+    def register(build):
+        SCENARIOS[name] = build
+        return build
+    return register
+
+
+@scenario("stage1")
+def stage1(engine, options):
+    # 가장 어려운 난이도 : 생성자에서 TSP 정답 계산, 이후 정답 경로대로 클릭
+    scene = engine.scenes.get("stage1", difficulty=3)
+    buttons = {btn.node_id: btn for btn in scene.buttons if hasattr(btn, "node_id")}
+
+    def script(frame, scene, held):
+        step = frame // 10
+        if frame % 10 == 0 and step < len(scene.best_path):
+            return click(buttons[scene.best_path[step]].rect.center)
+        return []
+
+    return scene, script
+
+
+@scenario("stage2")
+def stage2(engine, options):
+    # 그래프 위에 곡선을 그리고 Check 를 누르는 것을 반복
+    scene = engine.scenes.get("stage2")
+    check = scene.buttons[1]
+    w, h = scene.graph.WIDTH, scene.graph.HEIGHT
+    ox, oy = scene.graph_center_x, scene.graph_center_y
+
+    def script(frame, scene, held):
+        t = frame % 120
+        x = ox + 5 + t * (w - 10) // 100
+        y = oy + h // 2 + int(h * 0.3 * ((t % 20) - 10) / 10)
+        if t == 0:
+            scene.player_lines = []
+            return [pygame.event.Event(pygame.MOUSEBUTTONDOWN, pos=(x, y), button=1)]
+        if t < 100:
+            return [pygame.event.Event(pygame.MOUSEMOTION, pos=(x, y), rel=(0, 0), buttons=(1, 0, 0))]
+        if t == 100:
+            return [pygame.event.Event(pygame.MOUSEBUTTONUP, pos=(x, y), button=1)] + click(check.rect.center)
+        return []
+
+    return scene, script
+
+
+@scenario("stage3")
+def stage3(engine, options):
+    # 매 프레임 한 칸씩 좌우로 움직여 세대를 진행 (죽거나 클리어해도 계속 진행)
+    scene = engine.scenes.get("stage3", grid_w=options.grid, grid_h=options.grid, backend=options.backend)
+    scene.move_cooldown = 0
+    scene.target_turns = sys.maxsize
+
+    def script(frame, scene, held):
+        scene.is_dead = False
+        scene.last_move_time = -1
+        held.clear()
+        held.add(pygame.K_LEFT if frame // 20 % 2 else pygame.K_RIGHT)
+        return []
+
+    return scene, script
+
+
+@scenario("stage4")
+def stage4(engine, options):
+    # 일반 모드에서 정답/오답을 번갈아 입력. 오답 기록은 임시 파일에 저장
+    scene = engine.scenes.get("stage4", mistakes_path=os.path.join(tempfile.mkdtemp(), "mistakes.json"))
+
+    def script(frame, scene, held):
+        if scene.state != "game":
+            return key(pygame.K_SPACE) if frame % 10 == 0 else []
+        if frame % 15 == 0:
+            gs = scene.game_state
+            text = gs.current["meaning"].split("/")[0] if frame % 30 == 0 else "오답"
+            return [pygame.event.Event(pygame.TEXTINPUT, text=text)] + key(pygame.K_RETURN)
+        return []
+
+    return scene, script
+
+
+@scenario("stage5")
+def stage5(engine, options):
+    # 분석이 끝나면 곡을 시작하고, 레인 키를 돌아가며 누른다 (--audio 로 곡 지정)
+    kwargs = {"song_path": options.audio} if options.audio else {}
+    scene = engine.scenes.get("stage5", **kwargs)
+
+    def script(frame, scene, held):
+        if scene.loading or scene.error_message:
+            return []
+        if not scene.playing:
+            return key(pygame.K_SPACE)
+        if frame % 8 == 0 and scene.lane_keys:
+            keys = list(scene.lane_keys)
+            return key(keys[frame // 8 % len(keys)])
+        return []
+
+    return scene, script
+
+
+# -------------------------------------------------------
+# 실행
+# -------------------------------------------------------
+def run_scenario(engine, name, frames, options):
+    engine.profiler.scenes.clear()
+    text_cache.reset_stats()
+
+    t = perf_counter()
+    scene, script = SCENARIOS[name](engine, options)
+    setup_ms = (perf_counter() - t) * 1000
+    engine.change_scene(scene)
+
+    held = HeldKeys()
+    get_pressed = pygame.key.get_pressed
+    pygame.key.get_pressed = lambda: held
+    try:
+        t = perf_counter()
+        for frame in range(frames):
+            events = pygame.event.get() + script(frame, engine.scene, held)
+            engine.frame(events, fps=0, elapsed=engine.dt)
+        wall_ms = (perf_counter() - t) * 1000
+    finally:
+        pygame.key.get_pressed = get_pressed
+
+    return {
+        "scenario": name,
+        "frames": frames,
+        "setup_ms": setup_ms,
+        "wall_ms": wall_ms,
+        **engine.profiler.summary(engine.scenes.timings),
+    }
+
+
+def mean_ms(total, count):
+    return total / count if count else 0.0
+
+
+def print_report(result):
+    print(f"== {result['scenario']}  setup {result['setup_ms']:.1f} ms  "
+          f"{result['frames']} frames in {result['wall_ms']:.1f} ms")
+    for name, data in result["scenes"].items():
+        print(f"  {name} ({data['frames']} frames)")
+        if "loading" in data:
+            loading = data["loading"]
+            print(f"    import {loading['import_ms']:.1f} ms  "
+                  f"construct {loading['construct_ms']:.1f} ms / {loading['constructs']} "
+                  f"(mean {mean_ms(loading['construct_ms'], loading['constructs']):.1f})  "
+                  f"reset {loading['reset_ms']:.1f} ms / {loading['resets']} "
+                  f"(mean {mean_ms(loading['reset_ms'], loading['resets']):.1f})")
+        for phase in PHASES + ("frame",):
+            row = data["phases"][phase]
+            print(f"    {phase:<6} mean {row['mean']:8.3f}  p50 {row['p50']:8.3f}  "
+                  f"p95 {row['p95']:8.3f}  p99 {row['p99']:8.3f} ms")
+    print("  " + text_cache_line(result["text_cache"]))
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="장면별 헤드리스 벤치마크")
+    parser.add_argument("scenarios", nargs="*", default=sorted(SCENARIOS), help=", ".join(sorted(SCENARIOS)))
+    parser.add_argument("--frames", type=int, default=600)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--out", help="결과 JSON 저장 경로")
+    parser.add_argument("--grid", type=int, default=40, help="stage3 보드 크기")
+    parser.add_argument("--backend", default="array", choices=("array", "bits"), help="stage3 Life 구현")
+    parser.add_argument("--audio", help="stage5 에 쓸 오디오 파일")
+    options = parser.parse_args(argv)
+
+    for name in options.scenarios:
+        if name not in SCENARIOS:
+            parser.error(f"알 수 없는 시나리오: {name}")
+
+    engine = GameEngine(profile=True)
+    # 바뀐 게 없어도 매 프레임 그려서 기록한다 (커밋 간 프레임 수를 같게)
+    engine.skip_idle = False
+    results = []
+    for name in options.scenarios:
+        # 시나리오마다 같은 난수로 시작해서 커밋 간 비교가 가능하도록
+        random.seed(options.seed)
+        np.random.seed(options.seed)
+
+        result = run_scenario(engine, name, options.frames, options)
+        print_report(result)
+        results.append(result)
+
+    if options.out:
+        with open(options.out, "w", encoding="utf-8") as f:
+            json.dump(results, f, indent=2)
+        print("저장:", options.out)
+
+    pygame.quit()
+
+
+if __name__ == "__main__":
+    main()
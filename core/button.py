@@ -1,4 +1,24 @@
 import pygame
+from core.text import render_text
+
+# 같은 모양의 버튼은 그림(surface)을 같이 쓴다 : (크기, 글자, 글자 크기, 색) -> (기본, 호버)
+BUTTON_SURFACES = {}
+
+
+def button_surfaces(width, height, text, text_size, color, hover_color):
+    key = (width, height, text, text_size, color, hover_color)
+    surfaces = BUTTON_SURFACES.get(key)
+    if surfaces is None:
+        label = render_text(text, text_size, (0, 0, 0))
+        surfaces = []
+        for fill in (color, hover_color):
+            surf = pygame.Surface((width, height))
+            surf.fill(fill)
+            surf.blit(label, label.get_rect(center=(width // 2, height // 2)))
+            surfaces.append(surf)
+        surfaces = BUTTON_SURFACES[key] = tuple(surfaces)
+    return surfaces
+
 
 class Button:
     #버튼의 위치 x , y 버튼의 가로(width) 세로(height) ,버튼에 표시될 문자(text)와 크기, 버튼을 누르면 적용될 함수
@@ -9,22 +29,126 @@ class Button:
         self.text = text
         self.text_size = text_size
         self.callback = callback
-        self.font = pygame.font.SysFont(None, text_size)
         self.color = (200, 200, 200)
         self.hover_color = (255, 255, 255)
+        self.hovered = self.rect.collidepoint(pygame.mouse.get_pos())
+        self.render()
+
+    def render(self):
+        # 기본 / 호버 그림을 미리 만들어 둔다 (글자나 색을 바꾸면 다시 호출)
+        self.surfaces = button_surfaces(self.width, self.height, self.text, self.text_size,
+                                        self.color, self.hover_color)
 
     def draw(self, screen):
-        mouse_pos = pygame.mouse.get_pos()
-        if self.rect.collidepoint(mouse_pos):
-            pygame.draw.rect(screen, self.hover_color, self.rect)
-        else:
-            pygame.draw.rect(screen, self.color, self.rect)
+        screen.blit(self.surfaces[self.hovered], self.rect)
+
+    def set_hover(self, hovered):
+        # 호버 상태가 바뀌었으면 True (그때만 다시 그리면 됨)
+        changed = hovered != self.hovered
+        self.hovered = hovered
+        return changed
 
-        text_surface = self.font.render(self.text, True, (0, 0, 0))
-        text_rect = text_surface.get_rect(center=self.rect.center)
-        screen.blit(text_surface, text_rect)
+    def sync(self, pos):
+        # 장면을 다시 보여줄 때 지금 마우스 위치로 호버를 맞춘다
+        return self.set_hover(bool(self.rect.collidepoint(pos)))
 
     def handle_event(self, event):
-        if event.type == pygame.MOUSEBUTTONDOWN:
+        # 화면이 바뀌어야 하면 True (호버 전환 또는 클릭)
+        if event.type == pygame.MOUSEMOTION:
+            return self.set_hover(self.rect.collidepoint(event.pos))
+        elif event.type == pygame.WINDOWLEAVE:
+            return self.set_hover(False)
+        elif event.type == pygame.MOUSEBUTTONDOWN:
             if self.rect.collidepoint(event.pos):
                 self.callback()
+                return True
+        return False
+
+
+class ButtonGroup:
+    # 버튼 여러 개를 한 번에 처리. 화면을 CELL 크기 격자로 나눈 공간 해시로
+    # 마우스 위치의 버튼을 바로 찾으므로 버튼 수가 많아도 이벤트 하나에 격자 칸 하나만 본다.
+    # 겹치면 나중에 추가한 버튼이 위. 리스트처럼 순회할 수 있다.
+    CELL = 64
+
+    def __init__(self, buttons=()):
+        self.buttons = []
+        self.grid = {}
+        self.hovered = None
+        for btn in buttons:
+            self.add(btn)
+
+    def __iter__(self):
+        return iter(self.buttons)
+
+    def __len__(self):
+        return len(self.buttons)
+
+    def __getitem__(self, i):
+        return self.buttons[i]
+
+    def _cells(self, rect):
+        c = self.CELL
+        for cx in range(rect.left // c, (rect.right - 1) // c + 1):
+            for cy in range(rect.top // c, (rect.bottom - 1) // c + 1):
+                yield cx, cy
+
+    def add(self, btn):
+        self.buttons.append(btn)
+        for cell in self._cells(btn.rect):
+            self.grid.setdefault(cell, []).append(btn)
+        if btn.hovered:
+            if self.hovered is not None:
+                self.hovered.set_hover(False)
+            self.hovered = btn
+        return btn
+
+    def reindex(self):
+        # 버튼 위치를 바꿨으면 호출
+        buttons = self.buttons
+        self.buttons = []
+        self.grid = {}
+        self.hovered = None
+        for btn in buttons:
+            self.add(btn)
+
+    def button_at(self, pos):
+        cell = self.grid.get((pos[0] // self.CELL, pos[1] // self.CELL), ())
+        for btn in reversed(cell):
+            if btn.rect.collidepoint(pos):
+                return btn
+        return None
+
+    def set_hovered(self, btn):
+        if btn is self.hovered:
+            return False
+        if self.hovered is not None:
+            self.hovered.set_hover(False)
+        if btn is not None:
+            btn.set_hover(True)
+        self.hovered = btn
+        return True
+
+    def sync(self, pos):
+        # 장면을 다시 보여줄 때 (재사용, 미리 만든 장면) 지금 마우스 위치로 호버를 맞춘다
+        top = self.button_at(pos)
+        for btn in self.buttons:
+            btn.set_hover(btn is top)
+        self.hovered = top
+
+    def handle_event(self, event):
+        # 화면이 바뀌어야 하면 True (호버 전환 또는 클릭)
+        if event.type == pygame.MOUSEMOTION:
+            return self.set_hovered(self.button_at(event.pos))
+        elif event.type == pygame.WINDOWLEAVE:
+            return self.set_hovered(None)
+        elif event.type == pygame.MOUSEBUTTONDOWN:
+            btn = self.button_at(event.pos)
+            if btn is not None:
+                btn.callback()
+                return True
+        return False
+
+    def draw(self, screen):
+        for btn in self.buttons:
+            btn.draw(screen)
@@ -4,3 +4,9 @@ SCREEN_WIDTH = 800
 SCREEN_HEIGHT = 600
 TITLE = "various opensource minigame collection"
 FPS = 60
+
+# 게임 로직(update)은 고정 간격으로 진행하고, 그리기는 그 사이를 보간한다
+UPDATE_RATE = 60          # 초당 update 횟수
+MAX_UPDATES_PER_FRAME = 5 # 프레임이 크게 밀렸을 때 한 번에 따라잡는 최대 update 수
+SKIP_IDLE_REDRAW = True   # dirty 가 False 인 장면은 다시 그리지 않고 이벤트를 기다림
+IDLE_WAIT_MS = 250        # 그렇게 기다릴 때 최대 대기 시간 (update 는 이 간격으로라도 돈다)
@@ -1,33 +1,161 @@
 import pygame
-from core.config import SCREEN_WIDTH, SCREEN_HEIGHT, TITLE, FPS
+from time import perf_counter
+from core.config import (SCREEN_WIDTH, SCREEN_HEIGHT, TITLE, FPS,
+                         UPDATE_RATE, MAX_UPDATES_PER_FRAME, SKIP_IDLE_REDRAW, IDLE_WAIT_MS)
+from core.profiler import FrameProfiler
+from core.button import Button, ButtonGroup
+from core.scenes import SceneRegistry, LoadJob, LoadingScene
 
 class GameEngine:
-    def __init__(self):
+    def __init__(self, profile=False, profile_path=None):
         pygame.init()
         self.screen = pygame.display.set_mode((SCREEN_WIDTH, SCREEN_HEIGHT))
         pygame.display.set_caption(TITLE)
         self.clock = pygame.time.Clock()
         self.scene = None
+        self.full_update = True
+
+        # 고정 간격 update : dt 는 update 한 번이 진행하는 시간(초),
+        # alpha 는 마지막 update 이후 다음 update 까지 얼마나 왔는지 (그리기 보간용, 0~1)
+        self.dt = 1.0 / UPDATE_RATE
+        self.accumulator = 0.0
+        self.alpha = 0.0
+        self.last_time = perf_counter()
+        self.skip_idle = SKIP_IDLE_REDRAW
+        self.pending_events = []  # 대기 중에 받은 이벤트 (다음 프레임에 처리)
+
+        # 장면은 이름으로 연다 (필요할 때 import, reset() 이 있으면 인스턴스 재사용)
+        # 준비가 안 된 장면은 백그라운드에서 만들고 그동안 로딩 화면을 띄운다
+        self.scenes = SceneRegistry(self)
+
+        # 프로파일러는 켰을 때만 만든다 (F3: 오버레이, 종료 시 profile_path 에 저장)
+        self.profiler = FrameProfiler(profile_path) if profile else None
 
     def change_scene(self, scene):
         self.scene = scene
+        self.full_update = True
+        self.sync_hover(scene)
+
+    def sync_hover(self, scene):
+        # 재사용하거나 다른 스레드에서 미리 만든 장면은 버튼 호버가 예전 마우스 위치 기준이므로 지금 위치로 맞춘다
+        # (그룹은 겹친 버튼 중 위의 것만 켜도록 단독 버튼 다음에 맞춤)
+        pos = pygame.mouse.get_pos()
+        values = [v for v in vars(scene).values() if isinstance(v, (Button, ButtonGroup))] if scene else []
+        for value in sorted(values, key=lambda v: isinstance(v, ButtonGroup)):
+            value.sync(pos)
+
+    def show(self, name, **kwargs):
+        scene = self.scenes.request(name, **kwargs)
+        if isinstance(scene, LoadJob):
+            scene = LoadingScene(self, scene, self.scene)
+        self.change_scene(scene)
 
     def run(self, start_scene):
         self.change_scene(start_scene)
 
+        try:
+            while True:
+                events = self.pending_events + pygame.event.get()
+                self.pending_events = []
+                if not self.frame(events):
+                    break
+
+                # 다시 그릴 게 없으면 다음 이벤트가 올 때까지 잠든다 (CPU 사용 최소화)
+                if self.is_idle():
+                    event = pygame.event.wait(IDLE_WAIT_MS)
+                    if event.type != pygame.NOEVENT:
+                        self.pending_events.append(event)
+        finally:
+            self.close_scenes()
+
+        if self.profiler:
+            self.profiler.dump(loading=self.scenes.timings)
+        self.scenes.shutdown()
+        pygame.quit()
+
+    def close_scenes(self):
+        # 종료할 때 현재 장면과 재사용하려고 들고 있던 장면의 close() 를 부른다 (저장할 게 있는 장면용)
+        scenes = list(self.scenes.instances.values())
+        if self.scene is not None and self.scene not in scenes:
+            scenes.append(self.scene)
+        for scene in scenes:
+            close = getattr(scene, "close", None)
+            if close is not None:
+                close()
+
+    def is_idle(self):
+        # dirty 속성을 가진 장면만 무효화 방식을 쓴다 (없으면 매 프레임 그림)
+        return (self.skip_idle and not self.full_update
+                and not getattr(self.scene, "dirty", True)
+                and not (self.profiler and self.profiler.show_overlay))
+
+    def frame(self, events, fps=FPS, elapsed=None):
+        # 한 프레임 처리. QUIT 이벤트가 오면 False 를 돌려준다.
+        # fps 가 0 이면 프레임 제한 없이 바로 다음 프레임으로 넘어간다 (벤치마크용)
+        # elapsed 를 주면 실제 시간 대신 그만큼 흐른 것으로 친다 (벤치마크에서 프레임마다 update 1회)
         running = True
-        while running:
-            for event in pygame.event.get():
-                if event.type == pygame.QUIT:
-                    running = False
-                if self.scene:
-                    self.scene.handle_event(event)
+        t_start = perf_counter()
+        if elapsed is None:
+            elapsed = t_start - self.last_time
+        self.last_time = t_start
 
+        for event in events:
+            if event.type == pygame.QUIT:
+                running = False
+            elif event.type == pygame.WINDOWEXPOSED:
+                self.full_update = True
+            if self.profiler and self.profiler.handle_event(event):
+                self.full_update = True
+                continue
             if self.scene:
-                self.scene.update()
-                self.scene.draw(self.screen)
+                self.scene.handle_event(event)
+        t_event = perf_counter()
+
+        # 쌓인 시간만큼 고정 간격으로 update (너무 밀리면 버리고 따라잡지 않음)
+        self.accumulator += elapsed
+        steps = 0
+        while self.scene and self.accumulator >= self.dt:
+            if steps == MAX_UPDATES_PER_FRAME:
+                self.accumulator = 0.0
+                break
+            self.scene.update()
+            self.accumulator -= self.dt
+            steps += 1
+        self.alpha = self.accumulator / self.dt
+        t_update = perf_counter()
 
+        # 입력이나 상태 변화로 dirty 가 켜지지 않은 장면은 다시 그리지 않는다
+        if self.is_idle():
+            self.clock.tick(fps)
+            return running
+
+        # draw() 가 갱신 영역(rect 리스트)을 돌려주면 그 부분만 화면에 반영
+        dirty = None
+        t_draw = t_update
+        if self.scene:
+            dirty = self.scene.draw(self.screen)
+            if hasattr(self.scene, "dirty"):
+                self.scene.dirty = False
+            t_draw = perf_counter()
+
+        if self.profiler:
+            overlay = self.profiler.draw_overlay(self.screen, self.scene)
+            if overlay and dirty is not None:
+                dirty = list(dirty) + [overlay]
+
+        t_flip = perf_counter()
+        if dirty is None or self.full_update:
             pygame.display.flip()
-            self.clock.tick(FPS)
+            self.full_update = False
+        else:
+            pygame.display.update(dirty)
 
-        pygame.quit()
+        if self.profiler and self.scene:
+            self.profiler.record(self.scene, {
+                "event": (t_event - t_start) * 1000,
+                "update": (t_update - t_event) * 1000,
+                "draw": (t_draw - t_update) * 1000,
+                "flip": (perf_counter() - t_flip) * 1000,
+            })
+        self.clock.tick(fps)
+        return running
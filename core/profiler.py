@@ -0,0 +1,156 @@
+import csv
+import json
+import time
+from collections import deque
+
+import numpy as np
+import pygame
+
+from core.text import render_text, text_cache
+
+PHASES = ("event", "update", "draw", "flip")
+WINDOW = 600               # 백분위를 낼 때 쓰는 최근 프레임 수
+OVERLAY_REFRESH = 0.5      # 오버레이 글자를 다시 만드는 간격 (초)
+OVERLAY_KEY = pygame.K_F3
+
+
+class SceneStats:
+    # 장면 하나의 단계별 시간 (ms). 최근 WINDOW 프레임만 남기고 합계/횟수는 전체를 센다.
+    def __init__(self, window=WINDOW):
+        self.frames = 0
+        self.recent = {phase: deque(maxlen=window) for phase in PHASES + ("frame",)}
+        self.total = dict.fromkeys(PHASES + ("frame",), 0.0)
+
+    def add(self, times):
+        self.frames += 1
+        for phase, ms in times.items():
+            self.recent[phase].append(ms)
+            self.total[phase] += ms
+
+    def percentiles(self, phase="frame"):
+        data = self.recent[phase]
+        if not data:
+            return 0.0, 0.0, 0.0
+        p50, p95, p99 = np.percentile(np.fromiter(data, float, len(data)), (50, 95, 99))
+        return float(p50), float(p95), float(p99)
+
+    def summary(self):
+        rows = {}
+        for phase in PHASES + ("frame",):
+            p50, p95, p99 = self.percentiles(phase)
+            rows[phase] = {
+                "mean": self.total[phase] / self.frames if self.frames else 0.0,
+                "p50": p50,
+                "p95": p95,
+                "p99": p99,
+            }
+        return {"frames": self.frames, "phases": rows}
+
+
+def text_cache_line(stats):
+    total = stats["hits"] + stats["misses"]
+    rate = stats["hits"] / total * 100 if total else 0.0
+    return (f"text cache hit {rate:.1f}% ({stats['hits']}/{total}), "
+            f"{stats['surfaces']} surfaces, {stats['fonts']} fonts")
+
+
+class FrameProfiler:
+    # GameEngine 이 한 프레임의 단계별 시간을 넘겨주면 장면 클래스 이름별로 모은다.
+    def __init__(self, path=None):
+        self.path = path
+        self.scenes = {}
+        self.show_overlay = False
+        self.overlay_lines = []
+        self.overlay_time = 0.0
+        self.overlay_rect = pygame.Rect(0, 0, 0, 0)
+
+    def record(self, scene, times):
+        name = type(scene).__name__
+        stats = self.scenes.get(name)
+        if stats is None:
+            stats = self.scenes[name] = SceneStats()
+        times["frame"] = sum(times[phase] for phase in PHASES)
+        stats.add(times)
+
+    def handle_event(self, event):
+        if event.type == pygame.KEYDOWN and event.key == OVERLAY_KEY:
+            self.show_overlay = not self.show_overlay
+            self.overlay_time = 0.0
+            return True
+        return False
+
+    # -------------------------------
+    # 오버레이
+    # -------------------------------
+    def draw_overlay(self, screen, scene):
+        # 돌려주는 rect 는 이번 프레임에 갱신해야 할 영역 (이전 위치 포함)
+        if not self.show_overlay:
+            return None
+
+        stats = self.scenes.get(type(scene).__name__)
+        now = time.perf_counter()
+        if stats is not None and now - self.overlay_time >= OVERLAY_REFRESH:
+            self.overlay_time = now
+            p50, p95, p99 = stats.percentiles()
+            lines = [f"{type(scene).__name__}  {stats.frames} frames",
+                     f"frame p50 {p50:.2f}  p95 {p95:.2f}  p99 {p99:.2f} ms"]
+            for phase in PHASES:
+                p50, p95, _ = stats.percentiles(phase)
+                lines.append(f"{phase:<6} p50 {p50:.2f}  p95 {p95:.2f} ms")
+            lines.append(text_cache_line(text_cache.stats()))
+            self.overlay_lines = [render_text(line, 20, (255, 255, 0)) for line in lines]
+
+        if not self.overlay_lines:
+            return None
+
+        width = max(img.get_width() for img in self.overlay_lines) + 12
+        height = sum(img.get_height() for img in self.overlay_lines) + 12
+        rect = pygame.Rect(screen.get_width() - width - 8, 8, width, height)
+        pygame.draw.rect(screen, (0, 0, 0), rect)
+        y = rect.y + 6
+        for img in self.overlay_lines:
+            screen.blit(img, (rect.x + 6, y))
+            y += img.get_height()
+
+        dirty = rect.union(self.overlay_rect)
+        self.overlay_rect = rect
+        return dirty
+
+    # -------------------------------
+    # 저장
+    # -------------------------------
+    def summary(self, loading=None):
+        # loading : SceneRegistry.timings (장면 클래스별 import / 생성 / reset 시간)
+        # text_cache : 공용 글자 캐시의 적중 / 실패 횟수 (모든 장면 합계)
+        scenes = {name: stats.summary() for name, stats in self.scenes.items()}
+        for name, timing in (loading or {}).items():
+            if name in scenes:
+                scenes[name]["loading"] = timing
+        return {"scenes": scenes, "text_cache": text_cache.stats()}
+
+    def dump(self, path=None, loading=None):
+        path = path or self.path
+        if not path:
+            return
+
+        summary = self.summary(loading)
+        if path.endswith(".csv"):
+            with open(path, "w", newline="", encoding="utf-8") as f:
+                writer = csv.writer(f)
+                writer.writerow(["scene", "frames", "phase", "mean_ms", "p50_ms", "p95_ms", "p99_ms"])
+                for name, data in summary["scenes"].items():
+                    for phase, row in data["phases"].items():
+                        writer.writerow([name, data["frames"], phase,
+                                         f"{row['mean']:.4f}", f"{row['p50']:.4f}",
+                                         f"{row['p95']:.4f}", f"{row['p99']:.4f}"])
+                    for key in ("import_ms", "construct_ms", "reset_ms") if "loading" in data else ():
+                        writer.writerow([name, data["frames"], key[:-3],
+                                         f"{data['loading'][key]:.4f}", "", "", ""])
+                writer.writerow([])
+                writer.writerow(["text_cache"] + list(summary["text_cache"]))
+                writer.writerow([""] + list(summary["text_cache"].values()))
+        else:
+            with open(path, "w", encoding="utf-8") as f:
+                json.dump(summary, f, indent=2)
+
+        print("프로파일 저장:", path)
@@ -0,0 +1,222 @@
+import math
+import importlib
+import threading
+from time import perf_counter
+from concurrent.futures import ThreadPoolExecutor
+
+import pygame
+
+from core.text import render_text
+
+# 장면 이름 -> (모듈, 클래스). 모듈은 그 장면을 처음 열 때 import 한다.
+SCENES = {
+    "start": ("stages.start", "StartScreen"),
+    "select": ("stages.select", "StageSelectScreen"),
+    "stage1_difficulty": ("stages.stage1_difficulty", "Stage1DifficultyScreen"),
+    "stage1": ("stages.stage1", "Stage1"),
+    "stage2": ("stages.stage2", "Stage2"),
+    "stage3": ("stages.stage3", "Stage3"),
+    "stage4": ("stages.stage4", "Stage4"),
+    "stage5": ("stages.stage5", "Stage5"),
+}
+
+LOAD_WORKERS = 2
+LOADING_DELAY = 0.15  # 이보다 빨리 끝나면 로딩 화면을 그리지 않음 (초)
+
+
+class LoadJob:
+    # 백그라운드에서 만들고 있는 장면 하나 (progress 0~1, message 는 로딩 화면 표시용)
+    def __init__(self, name):
+        self.name = name
+        self.progress = 0.0
+        self.message = "대기 중"
+        self.future = None
+
+    def done(self):
+        return self.future.done()
+
+    def result(self):
+        return self.future.result()
+
+    def failed(self):
+        return self.future.done() and self.future.exception() is not None
+
+
+class SceneRegistry:
+    # 이름으로 장면을 만들고 다시 쓴다.
+    # reset() 이 있는 장면은 (이름, 인자) 별로 인스턴스를 하나만 두고, 다시 들어올 때 reset() 만 부른다.
+    # 없는 장면은 매번 새로 만든다.
+    # 모듈 import 와 생성은 스레드 풀에서도 할 수 있고 (request / prefetch), get 은 끝날 때까지 기다린다.
+    # pygame 객체를 넘겨야 하므로 프로세스 풀은 쓰지 않는다.
+    # 장면 클래스별 import / 생성 / reset 시간(ms) 합계와 횟수를 timings 에 남긴다.
+    def __init__(self, engine, scenes=SCENES, workers=LOAD_WORKERS):
+        self.engine = engine
+        self.scenes = scenes
+        self.classes = {}
+        self.instances = {}
+        self.timings = {}
+        self.jobs = {}  # (이름, 인자) -> 진행 중이거나 끝났지만 아직 안 쓴 LoadJob
+        self.import_lock = threading.Lock()
+        self.executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="scene")
+
+    def _timing(self, cls_name):
+        timing = self.timings.get(cls_name)
+        if timing is None:
+            timing = self.timings[cls_name] = {
+                "import_ms": 0.0,
+                "construct_ms": 0.0, "constructs": 0,
+                "reset_ms": 0.0, "resets": 0,
+            }
+        return timing
+
+    def _key(self, name, kwargs):
+        return (name, tuple(sorted(kwargs.items())))
+
+    def scene_class(self, name):
+        # 여러 스레드가 동시에 같은 모듈을 기다리며 시간을 중복으로 재지 않도록 잠금
+        with self.import_lock:
+            cls = self.classes.get(name)
+            if cls is None:
+                module_name, cls_name = self.scenes[name]
+                t = perf_counter()
+                module = importlib.import_module(module_name)
+                self._timing(cls_name)["import_ms"] += (perf_counter() - t) * 1000
+                cls = self.classes[name] = getattr(module, cls_name)
+            return cls
+
+    def _build(self, key, name, kwargs, job=None):
+        if job is not None:
+            job.message = "모듈 불러오는 중"
+        cls = self.scene_class(name)
+        timing = self._timing(cls.__name__)
+
+        if job is not None:
+            job.progress = 0.5
+            job.message = "장면 만드는 중"
+        t = perf_counter()
+        scene = cls(self.engine, **kwargs)
+        timing["construct_ms"] += (perf_counter() - t) * 1000
+        timing["constructs"] += 1
+
+        if hasattr(scene, "reset"):
+            self.instances[key] = scene
+        if job is not None:
+            job.progress = 1.0
+        return scene
+
+    def _reuse(self, key):
+        scene = self.instances.get(key)
+        if scene is None:
+            return None
+
+        timing = self._timing(type(scene).__name__)
+        t = perf_counter()
+        scene.reset()
+        timing["reset_ms"] += (perf_counter() - t) * 1000
+        timing["resets"] += 1
+        return scene
+
+    def _submit(self, key, name, kwargs):
+        job = self.jobs.get(key)
+        if job is None:
+            job = self.jobs[key] = LoadJob(name)
+            job.future = self.executor.submit(self._build, key, name, kwargs, job)
+        return job
+
+    def prefetch(self, name, **kwargs):
+        # 다음에 열릴 것 같은 장면을 미리 만들어 둔다 (이미 있거나 만드는 중이면 무시)
+        key = self._key(name, kwargs)
+        if key not in self.instances:
+            self._submit(key, name, kwargs)
+
+    def request(self, name, **kwargs):
+        # 바로 쓸 수 있으면 장면을, 아니면 백그라운드에서 만드는 LoadJob 을 돌려준다
+        key = self._key(name, kwargs)
+        job = self.jobs.get(key)
+        if job is None:
+            scene = self._reuse(key)
+            if scene is not None:
+                return scene
+            job = self._submit(key, name, kwargs)
+
+        if not job.done() or job.failed():
+            # 실패한 작업도 그대로 돌려준다 (로딩 화면이 에러를 알리고 이전 장면으로 돌아감)
+            return job
+        del self.jobs[key]
+        return job.result()
+
+    def get(self, name, **kwargs):
+        # 장면이 준비될 때까지 기다려서 돌려준다
+        key = self._key(name, kwargs)
+        job = self.jobs.pop(key, None)
+        if job is not None:
+            return job.result()
+
+        scene = self._reuse(key)
+        if scene is not None:
+            return scene
+        return self._build(key, name, kwargs)
+
+    def finish(self, job):
+        # 로딩 화면이 기다리던 작업을 꺼낸다 (예외가 있으면 그대로 올라감)
+        for key, pending in list(self.jobs.items()):
+            if pending is job:
+                del self.jobs[key]
+        return job.result()
+
+    def drop(self, name):
+        # 다음에 들어올 때 새로 만들도록 캐시에서 뺀다
+        for key in [key for key in self.instances if key[0] == name]:
+            del self.instances[key]
+
+    def shutdown(self):
+        self.executor.shutdown(wait=False, cancel_futures=True)
+
+
+class LoadingScene:
+    # 장면을 백그라운드에서 만드는 동안 띄우는 화면.
+    # 엔진 루프는 그대로 돌기 때문에 이벤트 처리가 멈추지 않는다.
+    def __init__(self, engine, job, previous=None):
+        self.engine = engine
+        self.job = job
+        self.previous = previous
+        self.start = perf_counter()
+
+    def handle_event(self, event):
+        pass
+
+    def update(self):
+        if not self.job.done():
+            return
+
+        try:
+            scene = self.engine.scenes.finish(self.job)
+        except Exception as e:
+            print("[에러] 장면 로딩 실패:", self.job.name, e)
+            scene = self.previous
+        if scene is not None:
+            self.engine.change_scene(scene)
+
+    def draw(self, screen):
+        elapsed = perf_counter() - self.start
+        if elapsed < LOADING_DELAY:
+            # 금방 끝나면 이전 화면을 그대로 둔다
+            return []
+
+        screen.fill((30, 30, 30))
+        w, h = screen.get_size()
+        text = render_text(f"Loading {self.job.name}...", 40, (255, 255, 255))
+        screen.blit(text, text.get_rect(center=(w // 2, h // 2 - 40)))
+
+        bar = pygame.Rect(w // 4, h // 2, w // 2, 20)
+        pygame.draw.rect(screen, (80, 80, 80), bar, 2)
+        fill = bar.inflate(-4, -4)
+        fill.width = int(fill.width * self.job.progress)
+        pygame.draw.rect(screen, (0, 200, 255), fill)
+
+        # 진행률이 멈춰 있어도 움직이는 표시
+        x = bar.x + int((math.sin(elapsed * 3) + 1) / 2 * (bar.width - 20))
+        pygame.draw.rect(screen, (255, 255, 255), (x, bar.bottom + 8, 20, 4))
+
+        msg = render_text(self.job.message, 24, (180, 180, 180))
+        screen.blit(msg, msg.get_rect(center=(w // 2, bar.bottom + 40)))
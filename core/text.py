@@ -0,0 +1,92 @@
+import os
+import threading
+from collections import OrderedDict
+
+import pygame
+
+# 렌더링해 둔 글자 surface 를 최대 몇 개까지 들고 있을지
+TEXT_CACHE_SIZE = 512
+
+
+class TextCache:
+    # 글꼴은 (이름, 크기) 별로 한 번만 만들고,
+    # 글자 surface 는 (글자, 글꼴, 색, 안티앨리어싱) 별로 LRU 로 재사용한다.
+    # 이름이 None 이면 기본 글꼴, 파일 경로면 그 파일, 아니면 시스템 글꼴 이름으로 본다.
+    # 돌려준 surface 는 여러 곳에서 같이 쓰므로 직접 그리거나 고치면 안 된다.
+    # 장면을 백그라운드 스레드에서 만들 때도 쓰이므로 잠금을 건다.
+    def __init__(self, max_size=TEXT_CACHE_SIZE):
+        self.max_size = max_size
+        self.lock = threading.RLock()
+        self.fonts = {}
+        self.surfaces = OrderedDict()
+
+        self.font_hits = 0
+        self.font_misses = 0
+        self.hits = 0
+        self.misses = 0
+
+    def get_font(self, name, size):
+        with self.lock:
+            return self._get_font(name, size)
+
+    def _get_font(self, name, size):
+        key = (name, size)
+        font = self.fonts.get(key)
+        if font is not None:
+            self.font_hits += 1
+            return font
+
+        self.font_misses += 1
+        if name is None or os.path.isfile(name):
+            font = pygame.font.Font(name, size)
+        else:
+            font = pygame.font.SysFont(name, size)
+        self.fonts[key] = font
+        return font
+
+    def render(self, text, size, color, name=None, antialias=True):
+        with self.lock:
+            return self._render(text, size, color, name, antialias)
+
+    def _render(self, text, size, color, name, antialias):
+        key = (text, name, size, tuple(color), antialias)
+        surf = self.surfaces.get(key)
+        if surf is not None:
+            self.hits += 1
+            self.surfaces.move_to_end(key)
+            return surf
+
+        self.misses += 1
+        surf = self._get_font(name, size).render(text, antialias, color)
+        self.surfaces[key] = surf
+        if len(self.surfaces) > self.max_size:
+            self.surfaces.popitem(last=False)
+        return surf
+
+    def stats(self):
+        return {
+            "fonts": len(self.fonts),
+            "font_hits": self.font_hits,
+            "font_misses": self.font_misses,
+            "surfaces": len(self.surfaces),
+            "hits": self.hits,
+            "misses": self.misses,
+        }
+
+    def reset_stats(self):
+        self.font_hits = self.font_misses = 0
+        self.hits = self.misses = 0
+
+    def clear(self):
+        self.surfaces.clear()
+
+
+text_cache = TextCache()
+
+
+def get_font(name, size):
+    return text_cache.get_font(name, size)
+
+
+def render_text(text, size, color, name=None, antialias=True):
+    return text_cache.render(text, size, color, name, antialias)
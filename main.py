@@ -1,9 +1,15 @@
+import argparse
+
 from core.engine import GameEngine
-from stages.start import StartScreen
 
 def main():
-    engine = GameEngine()
-    engine.run(StartScreen(engine))
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--profile", nargs="?", const="profile.json", default=None,
+                        help="프레임 시간 측정 (F3 오버레이), 종료 시 .json / .csv 로 저장")
+    args = parser.parse_args()
+
+    engine = GameEngine(profile=args.profile is not None, profile_path=args.profile)
+    engine.run(engine.scenes.get("start"))
 
 if __name__ == "__main__":
     main()
@@ -1,50 +1,48 @@
 import pygame
-from core.button import Button
+from core.button import Button, ButtonGroup
 
 class StageSelectScreen:
     def __init__(self, engine):
         self.engine = engine
-        self.buttons = [
+        self.buttons = ButtonGroup([
             Button(300, 100, 200, 60, "Stage 1", 40, self.start_stage1),
             Button(300, 170, 200, 60, "Stage 2", 40, self.start_stage2),
             Button(300, 240, 200, 60, "Stage 3", 40,self.start_stage3),
             Button(300, 310, 200, 60, "Stage 4", 40, self.start_stage4),
             Button(300, 380, 200, 60, "Stage 5", 40, self.start_stage5),
             Button(15, 15, 40, 40, "Back", 15, self.back_to_start)
-        ]
+        ])
+        self.dirty = True  # 다시 그려야 할 때만 True (엔진이 그린 뒤 끔)
+
+        # Stage1 퍼즐(TSP 정답 계산 포함)은 미리 만들어 둔다
+        for difficulty in (1, 2, 3):
+            self.engine.scenes.prefetch("stage1", difficulty=difficulty)
 
     def start_stage1(self):
-        from .stage1_difficulty import Stage1DifficultyScreen
-        self.engine.change_scene(Stage1DifficultyScreen(self.engine))
+        self.engine.show("stage1_difficulty")
 
     def start_stage2(self):
-        from .stage2 import Stage2
-        self.engine.change_scene(Stage2(self.engine))
+        self.engine.show("stage2")
 
     def start_stage3(self):
-        from .stage3 import Stage3
-        self.engine.change_scene(Stage3(self.engine))
+        self.engine.show("stage3")
 
     def start_stage4(self):
-        from .stage4 import Stage4
-        self.engine.change_scene(Stage4(self.engine))
+        self.engine.show("stage4")
 
     def start_stage5(self):
-        from .stage5 import Stage5
-        self.engine.change_scene(Stage5(self.engine))
+        self.engine.show("stage5")
 
     def back_to_start(self):
-        from .start import StartScreen
-        self.engine.change_scene(StartScreen(self.engine))
+        self.engine.show("start")
 
     def update(self):
         pass
 
     def draw(self, screen):
         screen.fill((100, 100, 100))
-        for btn in self.buttons:
-            btn.draw(screen)
+        self.buttons.draw(screen)
 
     def handle_event(self, event):
-        for btn in self.buttons:
-            btn.handle_event(event)
+        if self.buttons.handle_event(event):
+            self.dirty = True
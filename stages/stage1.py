@@ -1,30 +1,35 @@
 # Stage1 : NetworkX 최적 경로 찾기 게임
 import pygame
 import networkx
-import itertools
+import numpy as np
 import random
 import math
 
 from core.config import SCREEN_WIDTH, SCREEN_HEIGHT
-from core.button import Button
+from core.button import Button, ButtonGroup
+from core.text import render_text
+
+TSP_CHUNK = 4096  # Held-Karp 에서 한 번에 계산하는 mask 수
 
 class Stage1:
     def __init__(self, engine, difficulty):
         self.engine = engine
         self.difficulty = difficulty
-        self.buttons = []
+        self.buttons = ButtonGroup()
         self.nodes = []
         self.connections = []
         self.player_path = []
         self.last_button = None
         self.finished = False
         self.success = False
+        self.dirty = True  # 다시 그려야 할 때만 True (엔진이 그린 뒤 끔)
+        self.mouse_pos = pygame.mouse.get_pos()
         node_count = {1: 6, 2: 8, 3: 10}[self.difficulty]
         
         # Back 버튼 생성
         back_btn = Button(15, 15, 60, 40, "Back", 18,
                           callback=self.back_to_start)
-        self.buttons.append(back_btn)
+        self.buttons.add(back_btn)
         
         # 노드 생성
         self.nodes = self.generate_nodes(node_count)
@@ -38,22 +43,71 @@ class Stage1:
         self.node_to_buttons()
 
     def tsp_path_with_endpoints(self, G, start, end):
+        # Held-Karp 비트마스크 DP (시작/끝 고정)
+        # dp[j, mask] : start 에서 출발해 mask 의 중간 노드를 모두 방문하고 j 에서 끝나는 최단 거리
+        # (한 층의 mask 를 모을 때 j 별로 연속된 메모리가 되도록 j 가 앞 축)
         nodes = list(G.nodes())
         nodes.remove(start)
         nodes.remove(end)
 
-        best_length = float("inf")
-        best_path = None
-
-        for perm in itertools.permutations(nodes):
-            path = [start] + list(perm) + [end]
-            cost = sum(G[path[i]][path[i+1]]['weight'] for i in range(len(path)-1))
-
-            if cost < best_length:
-                best_length = cost
-                best_path = path
-
-        return best_path, best_length
+        order = [start] + nodes + [end]
+        dist = self.distance_matrix(G, order)
+
+        k = len(nodes)
+        if k == 0:
+            return [start, end], float(dist[0, 1])
+
+        inner = dist[1:k + 1, 1:k + 1]
+        full = 1 << k
+
+        dp = np.full((k, full), np.inf)
+        dp[np.arange(k), 1 << np.arange(k)] = dist[0, 1:k + 1]
+
+        # mask 를 방문한 노드 수(popcount) 순으로 정렬해 두고 층별로 자른다
+        masks = np.arange(full, dtype=np.int64)
+        popcount = np.zeros(full, dtype=np.uint8)  # uint8 이면 stable 정렬이 기수 정렬이라 빠르다
+        for b in range(k):
+            popcount += ((masks >> b) & 1).astype(np.uint8)
+        masks = masks[np.argsort(popcount, kind="stable")]
+        bounds = np.searchsorted(popcount[masks], np.arange(k + 2))
+
+        # 한 층의 dp 를 한 번만 모아서 (min, +) 곱으로 다음 노드 j 까지의 거리를 구하고
+        # j 를 아직 안 지난 mask 에서 mask | j 로 밀어 넣는다 (j 마다 목적지가 겹치지 않음)
+        # (min, +) 곱은 캐시에 들어가도록 TSP_CHUNK 개 mask 씩 나눠서 계산
+        for size in range(1, k):
+            prev = masks[bounds[size]:bounds[size + 1]]
+            cols = dp.take(prev, axis=1)
+            step = np.empty_like(cols)
+            for a in range(0, len(prev), TSP_CHUNK):
+                part = cols[:, a:a + TSP_CHUNK]
+                out = step[:, a:a + TSP_CHUNK]
+                tmp = np.empty_like(out)
+                np.add(inner[0][:, None], part[0], out=out)
+                for i in range(1, k):
+                    np.add(inner[i][:, None], part[i], out=tmp)
+                    np.minimum(out, tmp, out=out)
+            for j in range(k):
+                free = (prev >> j) & 1 == 0
+                dp[j, prev[free] | (1 << j)] = step[j, free]
+
+        total = dp[:, full - 1] + dist[1:k + 1, k + 1]
+        last = int(total.argmin())
+        best_length = float(total[last])
+
+        # 역추적 : 끝 노드부터 거꾸로 직전 노드를 다시 찾는다
+        path = [nodes[last]]
+        mask = full - 1
+        while mask & (mask - 1):
+            prev_mask = mask ^ (1 << last)
+            last = int((dp[:, prev_mask] + inner[:, last]).argmin())
+            mask = prev_mask
+            path.append(nodes[last])
+        path.reverse()
+
+        return [start] + path + [end], best_length
+
+    def distance_matrix(self, G, order):
+        return networkx.to_numpy_array(G, nodelist=order, weight="weight")
 
     def generate_nodes(self, count, min_dist=60):
         nodes = []
@@ -131,12 +185,11 @@ class Stage1:
             btn = Button(pos[0], pos[1], 40, 40, label, 20, None)
             setattr(btn, "node_id", node_id)
             btn.callback = lambda b=btn: self.node_clicked(b)
-            self.buttons.append(btn)
+            self.buttons.add(btn)
 
 
     def back_to_start(self):
-        from .stage1_difficulty import Stage1DifficultyScreen
-        self.engine.change_scene(Stage1DifficultyScreen(self.engine))
+        self.engine.show("stage1_difficulty")
 
     def update(self):
         pass
@@ -152,18 +205,16 @@ class Stage1:
         if self.last_button is not None and not self.finished:
             pygame.draw.line(screen, (0, 200, 255),
                              self.last_button.rect.center,
-                             pygame.mouse.get_pos(), 2)
+                             self.mouse_pos, 2)
 
         # 버튼 표시
-        for btn in self.buttons:
-            btn.draw(screen)
+        self.buttons.draw(screen)
 
         # 결과 메시지
         if self.finished:
-            font = pygame.font.SysFont(None, 50)
             msg = "SUCCESS!" if self.success else "TRY AGAIN!"
             color = (0, 255, 0) if self.success else (255, 0, 0)
-            text = font.render(msg, True, color)
+            text = render_text(msg, 50, color)
             screen.blit(text, (SCREEN_WIDTH//2 - 100, 50))
 
         # draw() 내부 아래에 추가
@@ -181,6 +232,11 @@ class Stage1:
 
 
     def handle_event(self, event):
-        if event.type == pygame.MOUSEBUTTONDOWN:
-            for btn in self.buttons:
-                btn.handle_event(event)
\ No newline at end of file
+        if event.type == pygame.MOUSEMOTION:
+            self.mouse_pos = event.pos
+            # 마지막 노드에서 마우스까지 선을 그리는 중이면 움직일 때마다 다시 그림
+            if self.last_button is not None and not self.finished:
+                self.dirty = True
+
+        if self.buttons.handle_event(event):
+            self.dirty = True
\ No newline at end of file
@@ -1,10 +1,10 @@
 import pygame
-from core.button import Button
+from core.button import Button, ButtonGroup
+from core.text import render_text
 
 class Stage1DifficultyScreen:
     def __init__(self, engine):
         self.engine = engine
-        self.buttons = []
 
         # 난이도 선택 버튼
         easy_btn = Button(300, 200, 200, 60, "Easy", 40,
@@ -17,15 +17,18 @@ class Stage1DifficultyScreen:
         back_btn = Button(15, 15, 40, 40, "Back", 15,
                           callback=self.back_to_select)
 
-        self.buttons.extend([easy_btn, normal_btn, hard_btn, back_btn])
+        self.buttons = ButtonGroup([easy_btn, normal_btn, hard_btn, back_btn])
+        self.dirty = True  # 다시 그려야 할 때만 True (엔진이 그린 뒤 끔)
+
+        # 앞에서 쓴 퍼즐이 있으면 다음 퍼즐을 미리 만든다
+        for difficulty in (1, 2, 3):
+            self.engine.scenes.prefetch("stage1", difficulty=difficulty)
 
     def start_stage1(self, difficulty):
-        from .stage1 import Stage1
-        self.engine.change_scene(Stage1(self.engine, difficulty=difficulty))
+        self.engine.show("stage1", difficulty=difficulty)
 
     def back_to_select(self):
-        from .select import StageSelectScreen
-        self.engine.change_scene(StageSelectScreen(self.engine))
+        self.engine.show("select")
 
     def update(self):
         pass
@@ -33,13 +36,11 @@ class Stage1DifficultyScreen:
     def draw(self, screen):
         screen.fill((50, 50, 50))
 
-        font = pygame.font.SysFont(None, 50)
-        text = font.render("Select Difficulty", True, (255, 255, 255))
+        text = render_text("Select Difficulty", 50, (255, 255, 255))
         screen.blit(text, (250, 120))
 
-        for btn in self.buttons:
-            btn.draw(screen)
+        self.buttons.draw(screen)
 
     def handle_event(self, event):
-        for btn in self.buttons:
-            btn.handle_event(event)
+        if self.buttons.handle_event(event):
+            self.dirty = True
@@ -1,36 +1,142 @@
 import pygame
-from math import *
+import os
+import csv
+import ast
 import random
-from core.button import Button
+import numpy as np
+from functools import lru_cache
+from core.button import Button, ButtonGroup
+from core.text import render_text
 from core.config import SCREEN_WIDTH, SCREEN_HEIGHT
 
+# --------------------------------------------------
+# 상대 경로 설정
+# --------------------------------------------------
+BASE_DIR = os.path.dirname(__file__)
+PROJECT_ROOT = os.path.dirname(BASE_DIR)
+DATA_DIR = os.path.join(PROJECT_ROOT, "data")
+FUNCTIONS_PATH = os.path.join(DATA_DIR, "functions.csv")
+
+# functions.csv 가 없을 때 사용할 기본 문제
+DEFAULT_FUNCTIONS = ("sin(x)", "cos(x)", "tan(x)", "x^2", "x^3", "exp(x)/5", "ln(x+6)", "abs(x)")
+
+
+# --------------------------------------------------
+# 수식 컴파일러 : "x^2 - 3*sin(x)" -> NumPy 배열을 받는 함수
+# 허용된 연산/함수/상수만 통과시키므로 임의 코드는 실행되지 않는다.
+# --------------------------------------------------
+FUNCTIONS = {
+    "sin": np.sin, "cos": np.cos, "tan": np.tan,
+    "asin": np.arcsin, "acos": np.arccos, "atan": np.arctan,
+    "sinh": np.sinh, "cosh": np.cosh, "tanh": np.tanh,
+    "exp": np.exp, "ln": np.log, "log": np.log, "log2": np.log2, "log10": np.log10,
+    "sqrt": np.sqrt, "abs": np.abs, "floor": np.floor, "ceil": np.ceil, "sign": np.sign,
+}
+CONSTANTS = {"pi": np.pi, "e": np.e}
+BIN_OPS = (ast.Add, ast.Sub, ast.Mult, ast.Div, ast.Pow, ast.Mod)
+UNARY_OPS = (ast.UAdd, ast.USub)
+
+
+def parse_expression(expr):
+    try:
+        tree = ast.parse(expr.replace("^", "**"), mode="eval")
+    except SyntaxError:
+        raise ValueError(f"수식 문법 오류: {expr}")
+    check_node(tree.body, expr)
+    return tree
+
+
+def check_node(node, expr):
+    if isinstance(node, ast.BinOp) and isinstance(node.op, BIN_OPS):
+        check_node(node.left, expr)
+        check_node(node.right, expr)
+    elif isinstance(node, ast.UnaryOp) and isinstance(node.op, UNARY_OPS):
+        check_node(node.operand, expr)
+    elif (isinstance(node, ast.Call) and isinstance(node.func, ast.Name)
+          and node.func.id in FUNCTIONS and len(node.args) == 1 and not node.keywords):
+        check_node(node.args[0], expr)
+    elif isinstance(node, ast.Name) and (node.id == "x" or node.id in CONSTANTS):
+        pass
+    elif (isinstance(node, ast.Constant) and isinstance(node.value, (int, float))
+          and not isinstance(node.value, bool)):
+        pass
+    else:
+        raise ValueError(f"지원하지 않는 수식: {expr}")
+
+
+class FloatConstants(ast.NodeTransformer):
+    # 숫자 상수를 np.float64 이름으로 바꿔서 9^9^9 같은 식도 파이썬 정수 연산 대신 inf 로 끝나게 한다
+    def __init__(self, namespace):
+        self.namespace = namespace
+
+    def visit_Constant(self, node):
+        name = f"_c{len(self.namespace)}"
+        self.namespace[name] = np.float64(node.value)
+        return ast.copy_location(ast.Name(id=name, ctx=ast.Load()), node)
+
+
+@lru_cache(maxsize=512)
+def compile_expression(expr):
+    namespace = {"__builtins__": {}, **FUNCTIONS, **CONSTANTS}
+    tree = ast.fix_missing_locations(FloatConstants(namespace).visit(parse_expression(expr)))
+    code = compile(tree, f"<{expr}>", "eval")
+
+    def evaluate(x):
+        return eval(code, namespace, {"x": x})
+
+    return evaluate
+
+
+@lru_cache(maxsize=None)
+def load_functions(path=FUNCTIONS_PATH):
+    if not os.path.exists(path):
+        return DEFAULT_FUNCTIONS
+
+    functions = []
+    with open(path, encoding="utf-8") as f:
+        for row in csv.DictReader(f):
+            expr = row.get("function", "").strip()
+            if not expr:
+                continue
+            try:
+                compile_expression(expr)
+            except ValueError as e:
+                print("[경고]", e)
+                continue
+            functions.append(expr)
+
+    print("함수 로딩:", len(functions))
+    return tuple(functions) or DEFAULT_FUNCTIONS
+
+
 class Stage2:
     def __init__(self, engine):
         self.engine = engine
 
-        self.buttons = [
+        self.buttons = ButtonGroup([
             Button(15, 15, 60, 40, "Back", 18, self.back_to_start),
             Button(15, 70, 60, 40, "Check", 18, self.check_answer)
-        ]
-
-        self.function_name = "tan(x)"
-
-        # 문제 그래프
-        self.problems = [
-            ("sin(x)", lambda x: sin(x)),
-            ("cos(x)", lambda x: cos(x)),
-            ("tan(x)", lambda x: tan(x)),
-            ("x^2",    lambda x: x*x),
-            ("x^3",    lambda x: x*x*x),
-            ("exp(x)/5", lambda x: exp(x)/5),
-            ("ln(x+6)", lambda x: log(x+6)),
-            ("abs(x)", lambda x: abs(x)),
-            ]
-        self.function_name, self.current_function = random.choice(self.problems)
+        ])
+
+        # 문제 목록 (data/functions.csv 의 수식 문자열, 컴파일 결과는 캐시됨)
+        self.problems = load_functions()
+
+        # 채점 방식 : "vertical" (같은 x 에서의 y 오차), "chamfer" (양방향 평균 거리), "hausdorff" (최대 거리)
+        self.metric = "vertical"
+
+        self.reset()
+
+    def reset(self):
+        # 새 문제 (장면을 다시 열 때도 호출됨)
+        self.function_name = random.choice(self.problems)
+        self.current_function = compile_expression(self.function_name)
 
         # 정답 그래프 렌더러
         self.graph = GraphRenderer(width=SCREEN_HEIGHT, height=SCREEN_HEIGHT, size=20, rate=1000,
                            func=self.current_function)
+        # 그래프 위치 (첫 draw() 전에 마우스 이벤트가 와도 쓸 수 있도록 미리 계산, draw() 에서 갱신)
+        self.graph_center_x = SCREEN_WIDTH // 2 - self.graph.WIDTH // 2
+        self.graph_center_y = SCREEN_HEIGHT // 2 - self.graph.HEIGHT // 2
 
         # 플레이어 그래프 (여러 선을 저장)
         self.player_lines = []
@@ -44,8 +150,7 @@ class Stage2:
         self.accuracy = None
 
     def back_to_start(self):
-        from .select import StageSelectScreen
-        self.engine.change_scene(StageSelectScreen(self.engine))
+        self.engine.show("select")
 
     # ---------------------------
     # Check 버튼 → 정답 비교
@@ -57,43 +162,61 @@ class Stage2:
     # ---------------------------
     # 정확도 비교 알고리즘
     # ---------------------------
-    def compare_graphs(self):
+    def compare_graphs(self, metric=None):
+        metric = metric or self.metric
 
-        all_points = []
-        for line in self.player_lines:
-            all_points.extend(line)
+        lines = [line for line in self.player_lines if line]
+        if sum(len(line) for line in lines) < 5:
+            return 0
+
+        # 플레이어 선 전체를 그래프 기준 픽셀 좌표로 (한 번에 변환)
+        pts = np.concatenate([np.asarray(line, dtype=float) for line in lines])
+        pts -= (self.graph_center_x, self.graph_center_y)
 
-        if len(all_points) < 5:
+        if metric == "vertical":
+            error = self.vertical_error(pts)
+        else:
+            error = self.curve_distance(pts, metric)
+
+        if error is None:
             return 0
 
-        player_math = []
-        for sx, sy in all_points:
-            mx = (sx - self.graph_center_x - self.graph.WIDTH/2) / (self.graph.WIDTH / self.graph.SIZE)
-            my = -(sy - self.graph_center_y - self.graph.HEIGHT/2) / (self.graph.HEIGHT / self.graph.SIZE)
-            player_math.append((mx, my))
+        accuracy = max(0, 100 - error * 3)
+        return round(accuracy, 2)
 
-        total_error = 0
-        n = 0
+    def vertical_error(self, pts):
+        # 플레이어 점의 x 에서 실제 문제 함수 값과 y 차이의 평균 (수학 좌표)
+        g = self.graph
+        mx = (pts[:, 0] - g.WIDTH/2) / (g.WIDTH / g.SIZE)
+        my = -(pts[:, 1] - g.HEIGHT/2) / (g.HEIGHT / g.SIZE)
 
-        for mx, my in player_math:
-            try:
-                correct_y = tan(mx)
-            except:
-                continue
+        with np.errstate(all="ignore"):
+            correct_y = np.asarray(self.current_function(mx), dtype=float) * np.ones_like(mx)
 
-            if abs(correct_y) > self.graph.SIZE:
-                continue
+        ok = np.isfinite(correct_y) & (np.abs(correct_y) <= g.SIZE)
+        if not ok.any():
+            return None
+        return float(np.mean(np.abs(correct_y[ok] - my[ok])))
 
-            total_error += abs(correct_y - my)
-            n += 1
+    def curve_distance(self, pts, metric):
+        # 플레이어 선 <-> 정답 곡선 사이 최근접 거리 (KD-tree), 수학 좌표 단위로 환산
+        segs = self.graph.segments()
+        if not segs:
+            return None
+        curve = np.concatenate(segs).astype(float)
 
-        if n == 0:
-            return 0
+        # scipy 는 import 가 무거워서 이 채점 방식을 처음 쓸 때 불러온다
+        from scipy.spatial import cKDTree
 
-        avg_error = total_error / n
-        accuracy = max(0, 100 - avg_error * 3)
+        d_player, _ = cKDTree(curve).query(pts)
+        d_curve, _ = cKDTree(pts).query(curve)
 
-        return round(accuracy, 2)
+        if metric == "hausdorff":
+            dist = max(d_player.max(), d_curve.max())
+        else:
+            dist = (d_player.mean() + d_curve.mean()) / 2
+
+        return float(dist) / (self.graph.WIDTH / self.graph.SIZE)
 
     # ---------------------------
     def update(self):
@@ -128,26 +251,22 @@ class Stage2:
             self.graph.draw_transparent(screen, self.graph_center_x, self.graph_center_y)
 
         # 정확도 텍스트
-        font = pygame.font.Font(None, 28)
         if self.accuracy is not None:
-            small_font = pygame.font.Font(None, 24)
-            acc = small_font.render(f"Accuracy: {self.accuracy}%", True, (255, 255, 0))
+            acc = render_text(f"Accuracy: {self.accuracy}%", 24, (255, 255, 0))
             screen.blit(acc, (self.graph_center_x + 10, self.graph_center_y + 10))
 
         # 버튼 그리기
-        for btn in self.buttons:
-            btn.draw(screen)
+        self.buttons.draw(screen)
 
         # 함수 이름을 Check 버튼 아래 표시
-        fname = font.render(self.function_name, True, (255, 255, 255))
+        fname = render_text(self.function_name, 28, (255, 255, 255))
         screen.blit(fname, (15, 130))
 
     # ---------------------------
     def handle_event(self, event):
 
         # 버튼 처리
-        for btn in self.buttons:
-            btn.handle_event(event)
+        self.buttons.handle_event(event)
 
         graph_rect = pygame.Rect(self.graph_center_x, self.graph_center_y,
                                  self.graph.WIDTH, self.graph.HEIGHT)
@@ -182,30 +301,49 @@ class GraphRenderer:
         self.HEIGHT = height
         self.SIZE = size
         self.RATE = rate
-        self.func = func
+        # 수식 문자열을 받으면 바로 컴파일해서 사용
+        self.func = compile_expression(func) if isinstance(func, str) else func
         self.compute_points()
 
         self.GRID = (80, 80, 80)
         self.AXES = (255, 255, 255)
         self.FNC = (255, 0, 0)
 
+        # 정답 오버레이 캐시 (함수 + 화면 설정이 같으면 다시 그리지 않음)
+        self.overlay = None
+        self.overlay_key = None
+
     def compute_points(self):
-        self.fp = []
-        cx = -self.SIZE / 2
-        while cx <= self.SIZE / 2:
-            try:
-                y = self.func(cx)
-                if -self.SIZE/2 <= y <= self.SIZE/2:
-                    self.fp.append((cx, y))
-            except:
-                pass
-            cx += 1 / self.RATE
-
-    # 화면 세팅 변환
-    def transform(self, x, y):
-        sx = self.WIDTH // 2 + x * (self.WIDTH / self.SIZE)
-        sy = self.HEIGHT // 2 - y * (self.HEIGHT / self.SIZE)
-        return int(sx), int(sy)
+        half = self.SIZE / 2
+        xs = np.linspace(-half, half, int(round(self.SIZE * self.RATE)) + 1)
+        with np.errstate(all="ignore"):
+            ys = np.asarray(self.func(xs), dtype=float) * np.ones_like(xs)
+
+        # NaN / inf / 화면 밖 값 제거
+        valid = np.isfinite(ys) & (ys >= -half) & (ys <= half)
+
+        # 불연속 지점 (tan(x) 점근선 등) : 값이 끊기거나 화면 높이만큼 튀는 곳에서 선을 나눈다
+        jump = np.abs(np.diff(ys)) > half
+        breaks = ~valid[1:] | ~valid[:-1] | jump
+        segment_id = np.concatenate(([0], np.cumsum(breaks)))
+
+        self.xs = xs[valid]
+        self.ys = ys[valid]
+        self.segment_id = segment_id[valid]
+        self.points_key = (self.func, self.SIZE, self.RATE)
+
+    def segments(self):
+        # 연속 구간별 화면 좌표 배열 (중복 픽셀 제거)
+        sx = (self.WIDTH // 2 + self.xs * (self.WIDTH / self.SIZE)).astype(int)
+        sy = (self.HEIGHT // 2 - self.ys * (self.HEIGHT / self.SIZE)).astype(int)
+        pts = np.column_stack((sx, sy))
+
+        keep = np.ones(len(pts), dtype=bool)
+        keep[1:] = (pts[1:] != pts[:-1]).any(axis=1) | (self.segment_id[1:] != self.segment_id[:-1])
+        pts, ids = pts[keep], self.segment_id[keep]
+
+        cuts = np.flatnonzero(np.diff(ids)) + 1
+        return np.split(pts, cuts) if len(pts) else []
 
     # 축과 grid 그리기
     def draw_axes(self, screen, ox, oy):
@@ -231,24 +369,36 @@ class GraphRenderer:
                          (ox + self.WIDTH // 2, oy),
                          (ox + self.WIDTH // 2, oy + self.HEIGHT), 2)
 
-    # 정답 오버레이
+    # 정답 오버레이 (한 번만 래스터화해서 캐시)
+    # 샘플은 함수나 보이는 범위(SIZE, RATE)가 바뀌었을 때만 다시 계산하고, 아니면 생성자에서 구한 것을 쓴다
     def draw_transparent(self, screen, ox, oy):
+        if self.points_key != (self.func, self.SIZE, self.RATE):
+            self.compute_points()
+        key = (self.points_key, self.WIDTH, self.HEIGHT)
+        if key != self.overlay_key:
+            self.overlay = self.render_overlay()
+            self.overlay_key = key
 
+        screen.blit(self.overlay, (ox, oy))
+
+    def render_overlay(self):
         overlay = pygame.Surface((self.WIDTH, self.HEIGHT), pygame.SRCALPHA)
+        color = (255, 0, 0, 140)
 
-        for x, y in self.fp:
-            sx, sy = self.transform(x, y)
-            pygame.draw.circle(overlay, (255, 0, 0, 140), (sx, sy), 3)
+        for seg in self.segments():
+            points = seg.tolist()
+            if len(points) > 1:
+                pygame.draw.lines(overlay, color, False, points, 6)
+            for p in points:
+                pygame.draw.circle(overlay, color, p, 3)
 
-        screen.blit(overlay, (ox, oy))
+        return overlay
 
     def draw_axes(self, screen, ox, oy):
 
         grid_step_x = self.WIDTH // 10
         grid_step_y = self.HEIGHT // 10
 
-        font = pygame.font.Font(None, 20)  # 아주 작은 글씨
-
         # ============================
         # Grid Lines
         # ============================
@@ -282,12 +432,12 @@ class GraphRenderer:
             tick_x_val = (i - 5) * (self.SIZE / 10)
             x_pos = ox + i * grid_step_x
 
-            label = font.render(f"{tick_x_val:.1f}", True, (180, 180, 180))
+            label = render_text(f"{tick_x_val:.1f}", 20, (180, 180, 180))  # 아주 작은 글씨
             screen.blit(label, (x_pos - label.get_width()//2, oy + self.HEIGHT//2 + 3))
 
             # -------------------- Y축 눈금 값 --------------------
             tick_y_val = (5 - i) * (self.SIZE / 10)
             y_pos = oy + i * grid_step_y
 
-            label = font.render(f"{tick_y_val:.1f}", True, (180, 180, 180))
+            label = render_text(f"{tick_y_val:.1f}", 20, (180, 180, 180))
             screen.blit(label, (ox + self.WIDTH//2 + 3, y_pos - label.get_height()//2))
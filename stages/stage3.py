@@ -2,9 +2,11 @@
 # https://github.com/marcpaulo15/game_of_life
 
 import pygame
-import random
 import numpy as np
-from core.button import Button
+from collections import namedtuple
+from functools import lru_cache
+from core.button import Button, ButtonGroup
+from core.text import render_text
 from core.config import SCREEN_WIDTH, SCREEN_HEIGHT
 
 CELL = 20
@@ -18,39 +20,82 @@ SCREEN_H = SCREEN_HEIGHT
 OFFSET_X = (SCREEN_W - BOARD_SIZE) // 2
 OFFSET_Y = (SCREEN_H - BOARD_SIZE) // 2
 
+MIN_CELL = 2  # 큰 보드에서 셀이 이보다 작아지면 플레이어 주변만 보여준다
+
+BG_COLOR = (0, 0, 0)
+LIFE_COLOR = (150, 150, 255)
+PLAYER_COLOR = (255, 60, 60)
+
 
 class Stage3:
-    def __init__(self, engine):
+    # backend : "array" (int ndarray) 또는 "bits" (uint64 비트 패킹, 큰 보드용)
+    def __init__(self, engine, grid_w=GRID_W, grid_h=GRID_H, backend="array"):
         self.engine = engine
-        self.buttons = [
+        self.buttons = ButtonGroup([
             Button(15, 15, 60, 40, "Back", 18, self.back_to_start)
-        ]
+        ])
 
-        # Universe & Player 초기화
-        self.universe = np.zeros((GRID_H, GRID_W), dtype=int)
-        self.random_seed(self.universe, density=0.25)
+        # 보드 크기 & 화면 배치
+        self.grid_w = grid_w
+        self.grid_h = grid_h
+        self.cell = max(MIN_CELL, min(CELL, BOARD_SIZE // max(grid_w, grid_h)))
+        self.view_w = min(grid_w, BOARD_SIZE // self.cell)
+        self.view_h = min(grid_h, BOARD_SIZE // self.cell)
+        self.offset_x = (SCREEN_W - self.view_w * self.cell) // 2
+        self.offset_y = (SCREEN_H - self.view_h * self.cell) // 2
 
-        self.player_x = GRID_H // 2
-        self.player_y = GRID_W // 2
+        self.backend = backend
+
+        # 미리보기용 HashLife 엔진 (처음 쓸 때 생성)
+        self.hashlife = None
 
         # 턴 시스템
-        self.survive_turns = 0
         self.target_turns = 20
 
         # 입력 쿨타임
-        self.last_move_time = 0
         self.move_cooldown = 300  # 0.3초
 
+        # 보드 캐시 surface : 세대가 바뀔 때 달라진 셀만 다시 칠한다
+        self.board_rect = pygame.Rect(self.offset_x, self.offset_y,
+                                      self.view_w * self.cell, self.view_h * self.cell)
+        self.board_surface = pygame.Surface(self.board_rect.size)
+
+        # 화면 갱신 영역 (텍스트/배너)
+        self.text_rect = pygame.Rect(0, self.board_rect.bottom + 5, SCREEN_W, 30)
+        self.banner_rect = pygame.Rect(0, 50, SCREEN_W, 60)
+
+        self.reset()
+
+    def reset(self):
+        # 새 판 시작 (장면을 다시 열 때도 호출됨)
+        # Universe & Player 초기화
+        if self.backend == "bits":
+            self.universe = BitUniverse.random(self.grid_h, self.grid_w, density=0.25)
+        else:
+            self.universe = np.zeros((self.grid_h, self.grid_w), dtype=int)
+            self.random_seed(self.universe, density=0.25)
+
+        self.player_x = self.grid_h // 2
+        self.player_y = self.grid_w // 2
+
+        self.survive_turns = 0
+        self.elapsed_ms = 0.0  # 고정 간격 update 로 흐른 시간
+        self.last_move_time = -self.move_cooldown
+
         # 게임 상태
         self.is_clear = False
         self.is_dead = False
 
+        self.drawn_universe = None
+        self.drawn_view = None
+        self.drawn_origin = None
+        self.drawn_state = None
+
     # ================================================================
     # 버튼 콜백
     # ================================================================
     def back_to_start(self):
-        from .select import StageSelectScreen
-        self.engine.change_scene(StageSelectScreen(self.engine))
+        self.engine.show("select")
 
 
     # ================================================================
@@ -63,22 +108,55 @@ class Stage3:
         else:
             return 1 if num == 3 else 0
 
+    def neighbor_count(self, universe):
+        # 0 으로 패딩한 뒤 8방향으로 민 배열을 더해 이웃 수를 한 번에 계산
+        h, w = universe.shape
+        padded = np.pad(universe, 1)
+        num = np.zeros_like(universe)
+        for dx in (-1, 0, 1):
+            for dy in (-1, 0, 1):
+                if dx == 0 and dy == 0:
+                    continue
+                num += padded[1 + dx:1 + dx + h, 1 + dy:1 + dy + w]
+        return num
+
     def generation(self, universe, player_pos):
+        if isinstance(universe, BitUniverse):
+            return universe.step(player_pos)
+
         px, py = player_pos
-        new_u = universe.copy()
+        num = self.neighbor_count(universe)
 
-        for i in range(GRID_H):
-            for j in range(GRID_W):
-                if (i, j) == (px, py):  # 플레이어 위치는 Life에서 제외
-                    new_u[i, j] = 0
-                    continue
-                new_u[i, j] = self.survival(i, j, universe)
+        alive = universe == 1
+        born = ~alive & (num == 3)
+        stay = alive & ((num == 2) | (num == 3))
+        new_u = (born | stay).astype(universe.dtype)
+
+        # survival() 과 동일한 결과를 위해: 0행/0열은 슬라이스가 비어 항상 죽은 칸이 된다
+        new_u[0, :] = 0
+        new_u[:, 0] = 0
 
+        new_u[px, py] = 0  # 플레이어 위치는 Life에서 제외
         return new_u
 
+    def advance(self, universe, player_pos, n):
+        # 플레이어가 제자리에 있다고 보고 n 세대를 한 번에 진행
+        for _ in range(n):
+            universe = self.generation(universe, player_pos)
+        return universe
+
+    def preview(self, turns):
+        # HashLife 로 turns 세대 뒤 보드를 미리 계산 (무한 평면 기준, 플레이어 제외 없음)
+        if self.hashlife is None:
+            self.hashlife = HashLife()
+        node, origin = self.hashlife.from_array(self.universe[:, :])
+        node, origin = self.hashlife.advance(node, origin, turns)
+        return self.hashlife.to_array(node, origin, (self.grid_h, self.grid_w))
+
     def player_dead(self, universe, px, py):
-        x1, x2 = max(px - 1, 0), min(px + 2, GRID_H)
-        y1, y2 = max(py - 1, 0), min(py + 2, GRID_W)
+        h, w = universe.shape
+        x1, x2 = max(px - 1, 0), min(px + 2, h)
+        y1, y2 = max(py - 1, 0), min(py + 2, w)
         neighbors = np.sum(universe[x1:x2, y1:y2])
         return neighbors >= 4
 
@@ -87,9 +165,7 @@ class Stage3:
     # 랜덤 Seed
     # ================================================================
     def random_seed(self, universe, density= 0.4):
-        for i in range(GRID_H):
-            for j in range(GRID_W):
-                universe[i][j] = 1 if random.random() < density else 0
+        universe[:] = np.random.random(universe.shape) < density
 
     # ================================================================
     def update(self):
@@ -98,7 +174,8 @@ class Stage3:
         if self.is_clear or self.is_dead:
             return
 
-        now = pygame.time.get_ticks()
+        self.elapsed_ms += self.engine.dt * 1000
+        now = self.elapsed_ms
         keys = pygame.key.get_pressed()
         moved = False
 
@@ -109,7 +186,7 @@ class Stage3:
                 self.player_y -= 1
                 moved = True
 
-            elif keys[pygame.K_RIGHT] and self.player_y < GRID_W - 1:
+            elif keys[pygame.K_RIGHT] and self.player_y < self.grid_w - 1:
                 self.player_y += 1
                 moved = True
 
@@ -117,7 +194,7 @@ class Stage3:
                 self.player_x -= 1
                 moved = True
 
-            elif keys[pygame.K_DOWN] and self.player_x < GRID_H - 1:
+            elif keys[pygame.K_DOWN] and self.player_x < self.grid_h - 1:
                 self.player_x += 1
                 moved = True
 
@@ -149,60 +226,338 @@ class Stage3:
     # ================================================================
     # 화면 그리기
     # ================================================================
+    def view_origin(self):
+        # 플레이어를 가운데 두되 보드 밖으로 나가지 않도록 고정
+        vx = min(max(self.player_x - self.view_h // 2, 0), self.grid_h - self.view_h)
+        vy = min(max(self.player_y - self.view_w // 2, 0), self.grid_w - self.view_w)
+        return vx, vy
+
+    def render_board(self):
+        vx, vy = self.view_origin()
+        if self.universe is self.drawn_universe and (vx, vy) == self.drawn_origin:
+            return
+
+        view = np.asarray(self.universe[vx:vx + self.view_h, vy:vy + self.view_w])
+        if self.drawn_view is None or (vx, vy) != self.drawn_origin:
+            # 처음 그리거나 view 가 스크롤되면 전체를 다시 칠한다
+            self.board_surface.fill(BG_COLOR)
+            changed = np.argwhere(view == 1)
+        else:
+            changed = np.argwhere(view != self.drawn_view)
+
+        for i, j in changed:
+            color = LIFE_COLOR if view[i, j] == 1 else BG_COLOR
+            self.board_surface.fill(color, (j * self.cell, i * self.cell, self.cell, self.cell))
+
+        self.drawn_universe = self.universe
+        self.drawn_view = view.copy()
+        self.drawn_origin = (vx, vy)
+
     def draw(self, screen):
-        screen.fill((0, 0, 0))
-
-        # Life 셀
-        for i in range(GRID_H):
-            for j in range(GRID_W):
-                if self.universe[i, j] == 1:
-                    pygame.draw.rect(
-                        screen,
-                        (150, 150, 255),
-                        (OFFSET_X + j * CELL,
-                         OFFSET_Y + i * CELL,
-                         CELL, CELL)
-                    )
+        # 상태가 그대로면 버튼만 다시 그리고 그 영역만 화면에 반영
+        state = (self.player_x, self.player_y, self.survive_turns, self.is_clear, self.is_dead)
+        if (state == self.drawn_state and self.universe is self.drawn_universe
+                and not self.engine.full_update):
+            self.buttons.draw(screen)
+            return [btn.rect for btn in self.buttons]
+        self.drawn_state = state
+
+        screen.fill(BG_COLOR)
+
+        # Life 셀 (보드가 화면보다 크면 플레이어 주변 view 영역만)
+        self.render_board()
+        screen.blit(self.board_surface, self.board_rect)
 
         # 플레이어
+        vx, vy = self.drawn_origin
         pygame.draw.rect(
             screen,
-            (255, 60, 60),
-            (OFFSET_X + self.player_y * CELL,
-             OFFSET_Y + self.player_x * CELL,
-             CELL, CELL)
+            PLAYER_COLOR,
+            (self.offset_x + (self.player_y - vy) * self.cell,
+             self.offset_y + (self.player_x - vx) * self.cell,
+             self.cell, self.cell)
         )
 
         # 생존 턴 텍스트
-        font = pygame.font.SysFont(None, 24)
-        msg = font.render(
-            f"Survive: {self.survive_turns}/{self.target_turns}",
-            True, (255, 255, 255)
-        )
-        screen.blit(msg, (OFFSET_X, OFFSET_Y + BOARD_SIZE + 10))
+        msg = render_text(f"Survive: {self.survive_turns}/{self.target_turns}", 24, (255, 255, 255))
+        screen.blit(msg, (self.offset_x, self.board_rect.bottom + 10))
 
         # CLEAR 표시
         if self.is_clear:
-            clear_font = pygame.font.SysFont(None, 70)
-            text = clear_font.render("CLEAR!", True, (255, 255, 0))
+            text = render_text("CLEAR!", 70, (255, 255, 0))
             rect = text.get_rect(center=(SCREEN_W // 2, 80))
             screen.blit(text, rect)
 
         # DEAD 표시
         if self.is_dead:
-            dead_font = pygame.font.SysFont(None, 70)
-            text = dead_font.render("DEAD!", True, (255, 80, 80))
+            text = render_text("DEAD!", 70, (255, 80, 80))
             rect = text.get_rect(center=(SCREEN_W // 2, 80))
             screen.blit(text, rect)
 
         # 버튼
-        for btn in self.buttons:
-            btn.draw(screen)
+        self.buttons.draw(screen)
+
+        return [self.board_rect, self.text_rect, self.banner_rect] + [btn.rect for btn in self.buttons]
 
 
     # ================================================================
     # 이벤트 처리
     # ================================================================
     def handle_event(self, event):
-        for btn in self.buttons:
-            btn.handle_event(event)
+        self.buttons.handle_event(event)
+
+
+# ===================================================================
+# BitUniverse : 한 칸을 1비트로 저장하는 큰 보드용 Universe
+# 각 행을 uint64 워드 배열로 묶고 (열 j -> 워드 j // 64 의 j % 64 번째 비트)
+# 8방향 이웃을 비트 단위 덧셈기로 더해 한 세대를 진행한다.
+# ===================================================================
+class BitUniverse:
+    WORD = 64
+
+    def __init__(self, height, width, words=None):
+        self.shape = (height, width)
+        self.n_words = (width + self.WORD - 1) // self.WORD
+        if words is None:
+            words = np.zeros((height, self.n_words), dtype=np.uint64)
+        self.words = words
+
+        # 마지막 워드에서 실제 칸에 해당하는 비트만 1
+        tail = width % self.WORD
+        self.tail_mask = np.uint64((1 << tail) - 1 if tail else (1 << self.WORD) - 1)
+
+    @classmethod
+    def from_array(cls, universe):
+        h, w = universe.shape
+        n_words = (w + cls.WORD - 1) // cls.WORD
+        packed = np.packbits(np.asarray(universe, dtype=bool), axis=1, bitorder="little")
+        buf = np.zeros((h, n_words * 8), dtype=np.uint8)
+        buf[:, :packed.shape[1]] = packed
+        return cls(h, w, buf.view("<u8").astype(np.uint64))
+
+    @classmethod
+    def random(cls, height, width, density=0.4, block_rows=256):
+        # 큰 보드도 float 배열 전체를 만들지 않도록 행 단위로 채운다
+        u = cls(height, width)
+        for r in range(0, height, block_rows):
+            rows = np.random.random((min(block_rows, height - r), width)) < density
+            u.words[r:r + len(rows)] = cls.from_array(rows).words
+        return u
+
+    def to_array(self, rows=slice(None), w0=0, w1=None):
+        words = self.words[rows, w0:w1]
+        bits = np.unpackbits(words.astype("<u8").view(np.uint8), axis=-1, bitorder="little")
+        return bits.astype(int)
+
+    def __getitem__(self, key):
+        # ndarray 처럼 universe[x, y] / universe[x1:x2, y1:y2] 읽기 지원
+        rows, cols = key
+        if not isinstance(cols, slice):
+            word = self.words[rows, cols // self.WORD]
+            return (word >> np.uint64(cols % self.WORD)) & np.uint64(1)
+
+        start, stop, _ = cols.indices(self.shape[1])
+        w0 = start // self.WORD
+        w1 = max(w0, (stop + self.WORD - 1) // self.WORD)
+        bits = self.to_array(rows, w0, w1)
+        return bits[..., start - w0 * self.WORD:stop - w0 * self.WORD]
+
+    def step(self, player_pos):
+        u = self.words
+        one = np.uint64(1)
+        top = np.uint64(self.WORD - 1)
+
+        def west(a):
+            # 열 j-1 의 값을 열 j 자리로 (워드 경계 carry 포함)
+            out = a << one
+            out[:, 1:] |= a[:, :-1] >> top
+            return out
+
+        def east(a):
+            # 열 j+1 의 값을 열 j 자리로
+            out = a >> one
+            out[:, :-1] |= a[:, 1:] << top
+            return out
+
+        up = np.zeros_like(u)
+        up[1:] = u[:-1]
+        down = np.zeros_like(u)
+        down[:-1] = u[1:]
+
+        # 8개의 1비트 이웃 평면을 3비트 카운터 (s2 는 4 이상이면 1) 로 더한다
+        s0 = np.zeros_like(u)
+        s1 = np.zeros_like(u)
+        s2 = np.zeros_like(u)
+        for n in (west(u), east(u), up, down, west(up), east(up), west(down), east(down)):
+            c0 = s0 & n
+            s0 ^= n
+            c1 = s1 & c0
+            s1 ^= c0
+            s2 |= c1
+
+        # 이웃 2 -> 살아있으면 유지, 이웃 3 -> 탄생
+        new = s1 & ~s2 & (s0 | u)
+        new[:, -1] &= self.tail_mask
+
+        # Stage3.generation 과 동일하게 0행/0열과 플레이어 칸은 죽은 칸
+        new[0, :] = 0
+        new[:, 0] &= ~one
+        px, py = player_pos
+        new[px, py // self.WORD] &= ~(one << np.uint64(py % self.WORD))
+
+        return BitUniverse(self.shape[0], self.shape[1], new)
+
+
+# ===================================================================
+# HashLife : 정규화된 quadtree + 메모이제이션으로 2^j 세대를 한 번에 건너뛴다
+# 무한 평면 위의 일반 Life 규칙을 따르므로 보드 경계, 0행/0열, 플레이어 칸은
+# 반영되지 않는다 (몇 만 턴 뒤 미리보기 / 멸종 여부 확인 용도).
+# ===================================================================
+# k: 레벨(한 변 2^k), a/b/c/d: 좌상/우상/좌하/우하, n: 살아있는 셀 수
+class QuadNode(namedtuple("QuadNode", "k a b c d n hash")):
+    __slots__ = ()
+
+    def __hash__(self):
+        return self.hash
+
+
+ON = QuadNode(0, None, None, None, None, 1, 1)
+OFF = QuadNode(0, None, None, None, None, 0, 0)
+
+
+class HashLife:
+    def __init__(self, cache_size=2 ** 18):
+        # 노드 정규화 / 계산 결과 캐시 모두 크기 제한 LRU (넘치면 오래된 것부터 버림)
+        self.join = lru_cache(maxsize=cache_size)(self._join)
+        self.zero = lru_cache(maxsize=64)(self._zero)
+        self.successor = lru_cache(maxsize=cache_size)(self._successor)
+
+    def clear_cache(self):
+        self.join.cache_clear()
+        self.zero.cache_clear()
+        self.successor.cache_clear()
+
+    def cache_info(self):
+        return {"join": self.join.cache_info(), "successor": self.successor.cache_info()}
+
+    # ---------------------------------------------------------------
+    # quadtree 기본 연산
+    # ---------------------------------------------------------------
+    def _join(self, a, b, c, d):
+        n = a.n + b.n + c.n + d.n
+        return QuadNode(a.k + 1, a, b, c, d, n, hash((a.k + 1, a.hash, b.hash, c.hash, d.hash)))
+
+    def _zero(self, k):
+        if k == 0:
+            return OFF
+        z = self.zero(k - 1)
+        return self.join(z, z, z, z)
+
+    def centre(self, m):
+        # m 을 가운데 두고 한 레벨 큰 빈 노드로 감싼다
+        z = self.zero(m.k - 1)
+        return self.join(
+            self.join(z, z, z, m.a), self.join(z, z, m.b, z),
+            self.join(z, m.c, z, z), self.join(m.d, z, z, z),
+        )
+
+    def inner(self, m):
+        return self.join(m.a.d, m.b.c, m.c.b, m.d.a)
+
+    def life(self, a, b, c, d, e, f, g, h, i):
+        outer = a.n + b.n + c.n + d.n + f.n + g.n + h.n + i.n
+        return ON if outer == 3 or (e.n and outer == 2) else OFF
+
+    def life_4x4(self, m):
+        ad = self.life(m.a.a, m.a.b, m.b.a, m.a.c, m.a.d, m.b.c, m.c.a, m.c.b, m.d.a)
+        bc = self.life(m.a.b, m.b.a, m.b.b, m.a.d, m.b.c, m.b.d, m.c.b, m.d.a, m.d.b)
+        cb = self.life(m.a.c, m.a.d, m.b.c, m.c.a, m.c.b, m.d.a, m.c.c, m.c.d, m.d.c)
+        da = self.life(m.a.d, m.b.c, m.b.d, m.c.b, m.d.a, m.d.b, m.c.d, m.d.c, m.d.d)
+        return self.join(ad, bc, cb, da)
+
+    def _successor(self, m, j):
+        # 레벨 k 노드의 가운데 (레벨 k-1) 를 2^j 세대 뒤로 (j <= k-2)
+        if m.n == 0:
+            return m.a
+        if m.k == 2:
+            return self.life_4x4(m)
+
+        join, step = self.join, self.successor
+        c1 = step(join(m.a.a, m.a.b, m.a.c, m.a.d), j)
+        c2 = step(join(m.a.b, m.b.a, m.a.d, m.b.c), j)
+        c3 = step(join(m.b.a, m.b.b, m.b.c, m.b.d), j)
+        c4 = step(join(m.a.c, m.a.d, m.c.a, m.c.b), j)
+        c5 = step(join(m.a.d, m.b.c, m.c.b, m.d.a), j)
+        c6 = step(join(m.b.c, m.b.d, m.d.a, m.d.b), j)
+        c7 = step(join(m.c.a, m.c.b, m.c.c, m.c.d), j)
+        c8 = step(join(m.c.b, m.d.a, m.c.d, m.d.c), j)
+        c9 = step(join(m.d.a, m.d.b, m.d.c, m.d.d), j)
+
+        if j < m.k - 2:
+            # 이미 2^j 세대 진행됨 -> 가운데 조각만 다시 모은다
+            return join(
+                join(c1.d, c2.c, c4.b, c5.a), join(c2.d, c3.c, c5.b, c6.a),
+                join(c4.d, c5.c, c7.b, c8.a), join(c5.d, c6.c, c8.b, c9.a),
+            )
+        return join(
+            step(join(c1, c2, c4, c5), j), step(join(c2, c3, c5, c6), j),
+            step(join(c4, c5, c7, c8), j), step(join(c5, c6, c8, c9), j),
+        )
+
+    # ---------------------------------------------------------------
+    # 세대 진행 : (node, 좌상단 좌표) 를 n 세대 뒤로
+    # ---------------------------------------------------------------
+    def advance(self, node, origin, n):
+        x0, y0 = origin
+        j = 0
+        while n:
+            if n & 1:
+                # 살아있는 셀이 가운데 절반 안에만 있어야 2^j 세대 동안 밖으로 새지 않는다
+                while node.k < max(j + 2, 3) or self.inner(node).n != node.n:
+                    half = 1 << (node.k - 1)
+                    node = self.centre(node)
+                    x0, y0 = x0 - half, y0 - half
+                node = self.successor(self.centre(node), j)
+            n >>= 1
+            j += 1
+        return node, (x0, y0)
+
+    # ---------------------------------------------------------------
+    # ndarray <-> quadtree 변환
+    # ---------------------------------------------------------------
+    def from_array(self, universe):
+        h, w = universe.shape
+        k = max(1, int(max(h, w) - 1).bit_length())
+        cells = np.zeros((1 << k, 1 << k), dtype=bool)
+        cells[:h, :w] = np.asarray(universe) == 1
+        return self._build(cells, k), (0, 0)
+
+    def _build(self, cells, k):
+        if not cells.any():
+            return self.zero(k)
+        if k == 0:
+            return ON
+        half = 1 << (k - 1)
+        return self.join(
+            self._build(cells[:half, :half], k - 1), self._build(cells[:half, half:], k - 1),
+            self._build(cells[half:, :half], k - 1), self._build(cells[half:, half:], k - 1),
+        )
+
+    def to_array(self, node, origin, shape):
+        # (0, 0) 부터 shape 크기의 창에 들어오는 셀만 잘라서 ndarray 로
+        out = np.zeros(shape, dtype=int)
+        self._fill(node, origin[0], origin[1], out)
+        return out
+
+    def _fill(self, node, x, y, out):
+        size = 1 << node.k
+        if node.n == 0 or x >= out.shape[0] or y >= out.shape[1] or x + size <= 0 or y + size <= 0:
+            return
+        if node.k == 0:
+            out[x, y] = 1
+            return
+        half = size >> 1
+        self._fill(node.a, x, y, out)
+        self._fill(node.b, x, y + half, out)
+        self._fill(node.c, x + half, y, out)
+        self._fill(node.d, x + half, y + half, out)
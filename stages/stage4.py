@@ -3,10 +3,12 @@ import os
 import csv
 import random
 import time
+import heapq
 from tinydb import TinyDB
-from rapidfuzz import fuzz
+from rapidfuzz import fuzz, process
 
 from core.button import Button
+from core.text import render_text
 from core.config import SCREEN_WIDTH, SCREEN_HEIGHT
 
 # --------------------------------------------------
@@ -18,11 +20,9 @@ DATA_DIR = os.path.join(PROJECT_ROOT, "data")
 FONT_DIR = os.path.join(BASE_DIR, "fonts")
 ASSET_DIR = os.path.join(BASE_DIR, "assets")
 
-
-os.makedirs(DATA_DIR, exist_ok=True)
-
+FONT_PATH = os.path.join(FONT_DIR, "NanumGothic.ttf")
 DB_PATH = os.path.join(DATA_DIR, "mistakes.json")
-db = TinyDB(DB_PATH)
+VOCAB_PATH = os.path.join(DATA_DIR, "vocab.csv")
 
 # 화면 크기 통일
 WIDTH = SCREEN_WIDTH
@@ -36,22 +36,42 @@ GREEN = (0, 200, 0)
 RED = (220, 50, 50)
 BLUE = (50, 130, 230)
 
+# 복습 설정
+REVIEW_ROUND_SIZE = 10      # 복습 한 판에 나오는 최대 단어 수
+REVIEW_RETRY_DELAY = 600    # 틀린 단어를 다시 내기까지 (초)
+DAY = 24 * 60 * 60
+
+# 채점 설정
+MATCH_CUTOFF = 80.0         # 이 유사도 이상이면 정답
+SIMILARITY_FLOOR = 50.0     # 이보다 낮은 유사도는 0 으로 본다 (rapidfuzz score_cutoff)
+JAMO_MATCH = False          # True 면 한글을 자모로 풀어서 비교 ("사과" / "사고" 같은 오타에 관대)
+
+# 한글 음절 -> 호환 자모 (초성 + 중성 + 종성) 변환표, str.translate 용
+CHOSEONG = "ㄱㄲㄴㄷㄸㄹㅁㅂㅃㅅㅆㅇㅈㅉㅊㅋㅌㅍㅎ"
+JUNGSEONG = "ㅏㅐㅑㅒㅓㅔㅕㅖㅗㅘㅙㅚㅛㅜㅝㅞㅟㅠㅡㅢㅣ"
+JONGSEONG = ("",) + tuple("ㄱㄲㄳㄴㄵㄶㄷㄹㄺㄻㄼㄽㄾㄿㅀㅁㅂㅄㅅㅆㅇㅈㅊㅋㅌㅍㅎ")
+HANGUL_JAMO = {
+    0xAC00 + i: CHOSEONG[i // 588] + JUNGSEONG[i % 588 // 28] + JONGSEONG[i % 28]
+    for i in range(11172)
+}
+
 
 # --------------------------------------------------
-# Font Loader
+# Font (있으면 NanumGothic 파일, 없으면 시스템 글꼴)
 # --------------------------------------------------
-def load_font(size):
-    font_path = os.path.join(FONT_DIR, "NanumGothic.ttf")
-    if os.path.exists(font_path):
-        return pygame.font.Font(font_path, size)
-    return pygame.font.SysFont("malgungothic", size)
+FONT_NAME = FONT_PATH if os.path.exists(FONT_PATH) else "malgungothic"
+TITLE_SIZE = 48
+MENU_SIZE = 24
+SMALL_SIZE = 18
+ANSWER_SIZE = 26
 
 
 # --------------------------------------------------
 # Draw Utility
+# 공용 글자 캐시(core.text)를 거치므로 매 프레임 같은 글자를 다시 렌더링하지 않는다
 # --------------------------------------------------
-def draw_text(surface, text, font, color, x, y, center=True):
-    img = font.render(text, True, color)
+def draw_text(surface, text, size, color, x, y, center=True):
+    img = render_text(text, size, color, FONT_NAME)
     rect = img.get_rect()
     if center:
         rect.center = (x, y)
@@ -61,16 +81,25 @@ def draw_text(surface, text, font, color, x, y, center=True):
 
 
 # --------------------------------------------------
-# Vocab Manager
+# Deck
+# 단어장 하나를 단어 / 뜻 병렬 리스트로 들고 있고, 정답 후보는 뜻 문자열별로 한 번만 정규화한다.
+# load_deck() 으로 열면 프로세스 안에서 경로당 한 번만 읽고 여러 장면이 같이 쓴다.
 # --------------------------------------------------
-class VocabManager:
-    def __init__(self, path=os.path.join(DATA_DIR, "vocab.csv")):
-        self.vocabs = []
+class Deck:
+    def __init__(self, path, jamo=JAMO_MATCH):
+        self.path = path
+        self.jamo = jamo
+        self.words = []
+        self.meanings = []
+        self.candidates = {}  # 뜻 문자열 -> 정규화된 정답 후보 tuple
         self.load_csv(path)
 
+    def __len__(self):
+        return len(self.words)
+
     def load_csv(self, path):
         if not os.path.exists(path):
-            print("[경고] vocab.csv 없음:", path)
+            print("[경고] 단어장 없음:", path)
             return
 
         with open(path, encoding="utf-8") as f:
@@ -79,22 +108,259 @@ class VocabManager:
                 word = row.get("word", "").strip()
                 meaning = row.get("meaning", "").strip()
                 if word and meaning:
-                    self.vocabs.append({"word": word, "meaning": meaning})
+                    self.words.append(word)
+                    self.meanings.append(meaning)
+                    self.candidates_for(meaning)
+
+        print("단어 로딩:", len(self.words))
 
-        print("단어 로딩:", len(self.vocabs))
+    def entry(self, i):
+        return {"word": self.words[i], "meaning": self.meanings[i]}
+
+    def normalize(self, text):
+        text = text.strip().replace(" ", "")
+        if self.jamo:
+            text = text.translate(HANGUL_JAMO)
+        return text
+
+    def candidates_for(self, meaning_str):
+        # "사과/능금" 처럼 / 로 나뉜 뜻을 한 번만 정규화해 둔다
+        cands = self.candidates.get(meaning_str)
+        if cands is None:
+            cands = tuple(self.normalize(m) for m in meaning_str.split("/") if m.strip())
+            self.candidates[meaning_str] = cands
+        return cands
+
+
+DECKS = {}  # (경로, 자모 여부) -> Deck
+
+
+def load_deck(path=VOCAB_PATH, jamo=JAMO_MATCH):
+    key = (os.path.abspath(path), jamo)
+    deck = DECKS.get(key)
+    if deck is None:
+        deck = Deck(path, jamo)
+        DECKS[key] = deck
+    return deck
+
+
+# --------------------------------------------------
+# Vocab Manager
+# 공유 Deck 위에서 문제를 뽑고 채점한다.
+# 뽑기는 Fisher-Yates 를 한 칸씩 진행하는 방식이라 한 문제당 O(1) 이고,
+# 덱을 한 바퀴 다 돌기 전에는 같은 단어가 다시 나오지 않는다.
+# 섞인 순서는 바뀐 칸만 dict 에 적어 두므로 덱 크기만큼 배열을 만들 필요가 없다.
+# --------------------------------------------------
+class VocabManager:
+    def __init__(self, path=VOCAB_PATH, jamo=JAMO_MATCH):
+        self.deck = load_deck(path, jamo)
+        self.drawn = 0
+        self.swaps = {}
 
     def get_random_vocab(self):
-        if not self.vocabs:
+        n = len(self.deck)
+        if not n:
             return {"word": "[NO_VOCAB]", "meaning": "vocab.csv 확인 필요"}
-        return random.choice(self.vocabs)
+
+        if self.drawn >= n:
+            # 한 바퀴 다 돌았으면 다시 섞는다
+            self.drawn = 0
+            self.swaps.clear()
+
+        k = self.drawn
+        j = random.randrange(k, n)
+        picked = self.swaps.get(j, j)
+        self.swaps[j] = self.swaps.get(k, k)
+        self.drawn += 1
+        return self.deck.entry(picked)
+
+    # -------------------------------
+    # 채점
+    # -------------------------------
+    def score_answer(self, answer, meaning_str):
+        user_norm = self.deck.normalize(answer)
+        if not user_norm:
+            return 0.0
+
+        best = process.extractOne(user_norm, self.deck.candidates_for(meaning_str), scorer=fuzz.ratio,
+                                  processor=None, score_cutoff=SIMILARITY_FLOOR)
+        return best[1] if best else 0.0
+
+
+# --------------------------------------------------
+# Mistake Store
+# 오답을 단어별로 집계해서 저장 (횟수, 마지막 시각, 최고 유사도)
+# 메모리 인덱스(단어 -> 레코드)를 두고, 변경분은 모아 두었다가 flush() 때 한 번에 기록한다.
+# --------------------------------------------------
+class MistakeStore:
+    TABLE = "words"
+
+    def __init__(self, path=DB_PATH):
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        self.db = TinyDB(path)
+        self.table = self.db.table(self.TABLE)
+
+        self.index = {}    # word -> 레코드
+        self.doc_ids = {}  # word -> TinyDB doc_id (아직 저장 안 된 단어는 없음)
+        self.pending = {}  # 변경된 단어 (순서 유지용 dict)
+
+        for doc in self.table.all():
+            word = doc["word"]
+            if word in self.index:
+                # 중복 행은 compact() 에서 합친다
+                self._merge(self.index[word], doc)
+                self.pending[word] = True
+            else:
+                self.index[word] = dict(doc)
+                self.doc_ids[word] = doc.doc_id
+
+        self.compact()
+
+    def __len__(self):
+        return len(self.index)
+
+    def _merge(self, rec, item):
+        rec["count"] += item.get("count", 1)
+        rec["last_seen"] = max(rec["last_seen"], item.get("last_seen", item.get("timestamp", 0.0)))
+        rec["best_similarity"] = max(rec["best_similarity"],
+                                     item.get("best_similarity", item.get("similarity", 0.0)))
+
+    def add(self, item):
+        word = item["word"]
+        rec = self.index.get(word)
+        if rec is None:
+            rec = {"word": word, "meaning": item["meaning"], "count": 0,
+                   "last_seen": 0.0, "best_similarity": 0.0, "last_answer": ""}
+            self.index[word] = rec
+
+        self._merge(rec, item)
+        rec["meaning"] = item["meaning"]
+        rec["last_answer"] = item.get("user_answer", rec["last_answer"])
+        self.pending[word] = True
+
+    def flush(self):
+        if not self.pending:
+            return
+
+        # 이미 저장된 단어는 update 한 번, 새 단어는 insert_multiple 한 번으로 기록
+        updated = [self.doc_ids[w] for w in self.pending if w in self.doc_ids]
+        if updated:
+            self.table.update(lambda doc: doc.update(self.index[doc["word"]]), doc_ids=updated)
+
+        new_words = [w for w in self.pending if w not in self.doc_ids]
+        if new_words:
+            ids = self.table.insert_multiple(self.index[w] for w in new_words)
+            self.doc_ids.update(zip(new_words, ids))
+
+        self.pending.clear()
+
+    def compact(self):
+        # 예전 형식(기본 테이블에 오답 1건당 1행)을 단어별 집계로 옮기고,
+        # 중복 행이 있으면 단어당 1행만 남도록 테이블을 다시 쓴다
+        legacy = self.db.table(TinyDB.default_table_name)
+        rows = legacy.all()
+        for row in rows:
+            self.add(row)
+
+        if len(self.table) != len(self.doc_ids):
+            self.table.truncate()
+            self.doc_ids = {}
+            self.pending = dict.fromkeys(self.index, True)
+
+        self.flush()
+        if rows:
+            self.db.drop_table(TinyDB.default_table_name)
+
+    def update(self, word, **fields):
+        self.index[word].update(fields)
+        self.pending[word] = True
+
+    def review_items(self):
+        return [{"word": rec["word"], "meaning": rec["meaning"]} for rec in self.index.values()]
+
+
+# --------------------------------------------------
+# Review Scheduler (SM-2)
+# 단어마다 ease / interval / reps / due 를 MistakeStore 레코드에 저장하고,
+# due 기준 힙으로 가장 오래 밀린 단어부터 꺼낸다.
+# 값이 바뀐 단어는 새 항목을 넣고, 예전 항목은 꺼낼 때 due 가 다르면 버린다.
+# --------------------------------------------------
+class ReviewScheduler:
+    def __init__(self, store):
+        self.store = store
+        self.heap = [(self.due(rec), word) for word, rec in store.index.items()]
+        heapq.heapify(self.heap)
+
+    def due(self, rec):
+        # 예전 기록은 마지막으로 틀린 시각부터 복습 대상
+        return rec.get("due", rec["last_seen"])
+
+    def _pop_valid(self):
+        while self.heap:
+            due, word = heapq.heappop(self.heap)
+            rec = self.store.index.get(word)
+            if rec is not None and self.due(rec) == due:
+                return due, word
+        return None
+
+    def next_round(self, size=REVIEW_ROUND_SIZE, now=None):
+        now = time.time() if now is None else now
+        picked = []
+        while len(picked) < size:
+            item = self._pop_valid()
+            if item is None:
+                break
+            if item[0] > now:
+                heapq.heappush(self.heap, item)
+                break
+            picked.append(item)
+
+        # 채점 전에 나가도 잃어버리지 않도록 다시 넣어 둔다 (채점되면 due 가 바뀌어 무효가 됨)
+        for item in picked:
+            heapq.heappush(self.heap, item)
+
+        return [{"word": w, "meaning": self.store.index[w]["meaning"]} for _, w in picked]
+
+    def quality(self, ok, similarity):
+        if ok:
+            return 5 if similarity >= 95 else 4
+        return 2 if similarity >= 60 else 0
+
+    def grade(self, word, ok, similarity, now=None, retry_delay=REVIEW_RETRY_DELAY):
+        # retry_delay : 틀렸을 때 다시 내기까지 (일반 모드에서 처음 틀린 단어는 0 이라 바로 복습 가능)
+        rec = self.store.index.get(word)
+        if rec is None:
+            return
+
+        now = time.time() if now is None else now
+        q = self.quality(ok, similarity)
+        ease = rec.get("ease", 2.5)
+        reps = rec.get("reps", 0)
+        interval = rec.get("interval", 0)
+
+        if q < 3:
+            reps = 0
+            interval = 0
+            due = now + retry_delay
+        else:
+            reps += 1
+            interval = 1 if reps == 1 else 6 if reps == 2 else round(interval * ease)
+            due = now + interval * DAY
+        ease = max(1.3, ease + 0.1 - (5 - q) * (0.08 + (5 - q) * 0.02))
+
+        self.store.update(word, ease=ease, reps=reps, interval=interval, due=due)
+        heapq.heappush(self.heap, (due, word))
 
 
 # --------------------------------------------------
 # Game State
 # --------------------------------------------------
 class GameState:
-    def __init__(self, vocab_manager, total_questions=10, mode="normal", review_list=None):
+    def __init__(self, vocab_manager, total_questions=10, mode="normal", review_list=None,
+                 mistake_store=None, scheduler=None):
         self.vocab_manager = vocab_manager
+        self.mistake_store = mistake_store
+        self.scheduler = scheduler
         self.mode = mode
         self.review_list = review_list or []
 
@@ -113,6 +379,7 @@ class GameState:
         self.wrong_list = []
 
         self.word_y = 60
+        self.prev_word_y = 60  # 직전 update 의 위치 (그리기 보간용)
         self.word_speed = 80.0
 
         self.running = True
@@ -127,27 +394,39 @@ class GameState:
             return None
         return self.vocab_manager.get_random_vocab()
 
+    def finish(self):
+        self.running = False
+        # 라운드가 끝나면 모아 둔 오답을 한 번에 기록
+        if self.mistake_store is not None:
+            self.mistake_store.flush()
+
     def next_question(self):
         if self.question_index >= self.total_questions:
-            self.running = False
+            self.finish()
             return
 
         self.question_index += 1
         self.current = self._get_question_by_index(self.question_index)
         self.typed_text = ""
         self.word_y = 60
+        self.prev_word_y = 60
 
         if self.current is None:
-            self.running = False
+            self.finish()
 
     def update_fall(self, dt):
         if not self.running or self.current is None:
             return
 
+        self.prev_word_y = self.word_y
         self.word_y += self.word_speed * dt
         if self.word_y > HEIGHT - 120:
             self.register_answer(auto_timeout=True)
 
+    def draw_y(self, alpha):
+        # 고정 간격 update 사이를 선형 보간한 위치
+        return self.prev_word_y + (self.word_y - self.prev_word_y) * alpha
+
     def handle_char_input(self, ch):
         if ch.isprintable():
             self.typed_text += ch
@@ -156,33 +435,16 @@ class GameState:
         if self.typed_text:
             self.typed_text = self.typed_text[:-1]
 
-    def _normalize(self, text):
-        return text.strip().replace(" ", "")
-
     def _is_answer_correct(self, user_answer, meaning_str, auto_timeout):
         if auto_timeout:
             return False, 0.0
 
-        user_norm = self._normalize(user_answer)
-        if not user_norm:
-            return False, 0.0
-
-        candidates = [
-            self._normalize(m)
-            for m in meaning_str.split("/")
-            if m.strip()
-        ]
-
-        best = 0.0
-        for c in candidates:
-            score = fuzz.ratio(user_norm, c)
-            best = max(best, score)
-
-        return best >= 80.0, best
+        best = self.vocab_manager.score_answer(user_answer, meaning_str)
+        return best >= MATCH_CUTOFF, best
 
     def register_answer(self, auto_timeout=False):
         if not self.current:
-            self.running = False
+            self.finish()
             return
 
         meaning_str = self.current["meaning"]
@@ -202,7 +464,14 @@ class GameState:
                 "timestamp": time.time()
             }
             self.wrong_list.append(wrong_item)
-            db.insert(wrong_item)
+            if self.mistake_store is not None:
+                self.mistake_store.add(wrong_item)
+
+        # 복습 모드의 모든 답, 일반 모드의 오답으로 복습 일정 갱신
+        # 재시도 대기는 복습 모드에서 또 틀렸을 때만 (일반 모드 오답은 바로 R 로 복습할 수 있게)
+        if self.scheduler is not None and (self.mode == "review" or not ok):
+            delay = REVIEW_RETRY_DELAY if self.mode == "review" else 0
+            self.scheduler.grade(self.current["word"], ok, score, retry_delay=delay)
 
         self.next_question()
 
@@ -211,18 +480,20 @@ class GameState:
 # Stage4 Scene
 # --------------------------------------------------
 class Stage4:
-    def __init__(self, engine):
+    def __init__(self, engine, deck_path=VOCAB_PATH, mistakes_path=DB_PATH):
         self.engine = engine
 
         # Back 버튼
         self.back_button = Button(15, 15, 60, 40, "Back", 20, self.back_to_menu)
 
-        self.title_font = load_font(48)
-        self.menu_font = load_font(24)
-        self.small_font = load_font(18)
-        self.answer_font = load_font(26)
+        self.vocab_manager = VocabManager(deck_path)
+        self.mistakes = MistakeStore(mistakes_path)
+        self.scheduler = ReviewScheduler(self.mistakes)
+        self.review_size = REVIEW_ROUND_SIZE
+        self.reset()
 
-        self.vocab_manager = VocabManager(os.path.join(DATA_DIR, "vocab.csv"))
+    def reset(self):
+        # 장면을 다시 열면 메뉴부터 (단어장과 오답 기록은 그대로 사용)
         self.state = "menu"
         self.game_state = None
         self.menu_message = ""
@@ -231,13 +502,23 @@ class Stage4:
     # Scene control
     # -------------------------------
     def back_to_menu(self):
-        from .select import StageSelectScreen
-        self.engine.change_scene(StageSelectScreen(self.engine))
+        # 라운드 중간에 나가도 오답은 남긴다
+        self.mistakes.flush()
+        self.engine.show("select")
+
+    def close(self):
+        # 게임을 끌 때 (창 닫기, 시작 화면의 End) 엔진이 부른다
+        self.mistakes.flush()
 
     # -------------------------------
     # Event handler
     # -------------------------------
     def handle_event(self, event):
+        if event.type == pygame.QUIT:
+            # 라운드 중에 창을 닫아도 오답은 남긴다
+            self.mistakes.flush()
+            return
+
         self.back_button.handle_event(event)
 
         if self.state == "menu":
@@ -250,20 +531,29 @@ class Stage4:
     def _handle_menu_event(self, event):
         if event.type == pygame.KEYDOWN:
             if event.key == pygame.K_SPACE:
-                self.game_state = GameState(self.vocab_manager, total_questions=10, mode="normal")
+                self.game_state = self._new_game("normal")
                 self.state = "game"
             elif event.key == pygame.K_r:
-                mistakes = db.all()
-                if not mistakes:
+                if not len(self.mistakes):
                     self.menu_message = "저장된 오답이 없습니다."
+                    return
+                self.game_state = self._new_game("review")
+                if self.game_state is None:
+                    self.menu_message = "지금 복습할 단어가 없습니다."
                 else:
-                    review_list = [
-                        {"word": m["word"], "meaning": m["meaning"]}
-                        for m in mistakes
-                    ]
-                    self.game_state = GameState(self.vocab_manager, mode="review", review_list=review_list)
                     self.state = "game"
 
+    def _new_game(self, mode):
+        if mode == "normal":
+            return GameState(self.vocab_manager, total_questions=10, mode="normal",
+                             mistake_store=self.mistakes, scheduler=self.scheduler)
+
+        review_list = self.scheduler.next_round(self.review_size)
+        if not review_list:
+            return None
+        return GameState(self.vocab_manager, mode="review", review_list=review_list,
+                         mistake_store=self.mistakes, scheduler=self.scheduler)
+
     def _handle_game_event(self, event):
         if event.type == pygame.KEYDOWN:
             if event.key == pygame.K_RETURN:
@@ -280,20 +570,12 @@ class Stage4:
         if event.type == pygame.KEYDOWN:
             if event.key == pygame.K_SPACE:
                 # 동일 모드 재시작
-                if self.game_state.mode == "normal":
-                    self.game_state = GameState(self.vocab_manager, total_questions=10, mode="normal")
-                else:
-                    mistakes = db.all()
-                    if mistakes:
-                        review_list = [
-                            {"word": m["word"], "meaning": m["meaning"]}
-                            for m in mistakes
-                        ]
-                        self.game_state = GameState(self.vocab_manager, mode="review", review_list=review_list)
-                    else:
-                        self.menu_message = "오답 없음"
-                        self.state = "menu"
-                        return
+                game_state = self._new_game(self.game_state.mode)
+                if game_state is None:
+                    self.menu_message = "지금 복습할 단어가 없습니다."
+                    self.state = "menu"
+                    return
+                self.game_state = game_state
                 self.state = "game"
 
     # -------------------------------
@@ -301,8 +583,7 @@ class Stage4:
     # -------------------------------
     def update(self):
         if self.state == "game" and self.game_state and self.game_state.running:
-            dt = self.engine.clock.get_time() / 1000.0
-            self.game_state.update_fall(dt)
+            self.game_state.update_fall(self.engine.dt)
             if not self.game_state.running:
                 self.state = "result"
 
@@ -325,46 +606,46 @@ class Stage4:
     # Drawing functions
     # -------------------------------
     def _draw_menu(self, screen):
-        draw_text(screen, "영단어 뜻 맞추기 게임", self.title_font, WHITE, WIDTH//2, 150)
-        draw_text(screen, "[SPACE] 일반 모드 시작", self.menu_font, GREEN, WIDTH//2, 260)
-        draw_text(screen, "[R] 오답 복습 모드", self.menu_font, BLUE, WIDTH//2, 300)
+        draw_text(screen, "영단어 뜻 맞추기 게임", TITLE_SIZE, WHITE, WIDTH//2, 150)
+        draw_text(screen, "[SPACE] 일반 모드 시작", MENU_SIZE, GREEN, WIDTH//2, 260)
+        draw_text(screen, "[R] 오답 복습 모드", MENU_SIZE, BLUE, WIDTH//2, 300)
 
         if self.menu_message:
-            draw_text(screen, self.menu_message, self.small_font, RED, WIDTH//2, 350)
+            draw_text(screen, self.menu_message, SMALL_SIZE, RED, WIDTH//2, 350)
 
     def _draw_game(self, screen):
         gs = self.game_state
 
-        draw_text(screen, f"{gs.question_index}/{gs.total_questions}", self.small_font, WHITE, 20, 70, center=False)
+        draw_text(screen, f"{gs.question_index}/{gs.total_questions}", SMALL_SIZE, WHITE, 20, 70, center=False)
         draw_text(screen, f"맞음:{gs.correct_count}  틀림:{gs.wrong_count}",
-                  self.small_font, WHITE, WIDTH - 180, 70, center=False)
+                  SMALL_SIZE, WHITE, WIDTH - 180, 70, center=False)
 
         if gs.current:
-            draw_text(screen, gs.current["word"], self.title_font, WHITE, WIDTH//2, int(gs.word_y))
+            draw_text(screen, gs.current["word"], TITLE_SIZE, WHITE, WIDTH//2, int(gs.draw_y(self.engine.alpha)))
         else:
-            draw_text(screen, "(문제 없음)", self.menu_font, GRAY, WIDTH//2, HEIGHT//2)
+            draw_text(screen, "(문제 없음)", MENU_SIZE, GRAY, WIDTH//2, HEIGHT//2)
 
         # 입력 창
         pygame.draw.rect(screen, (25, 25, 60), (80, HEIGHT - 120, WIDTH - 160, 60), border_radius=12)
         pygame.draw.rect(screen, BLUE, (80, HEIGHT - 120, WIDTH - 160, 60), 2, border_radius=12)
 
-        draw_text(screen, "뜻:", self.small_font, GRAY, 100, HEIGHT - 90, center=False)
-        draw_text(screen, gs.typed_text, self.answer_font, WHITE, 160, HEIGHT - 90, center=False)
+        draw_text(screen, "뜻:", SMALL_SIZE, GRAY, 100, HEIGHT - 90, center=False)
+        draw_text(screen, gs.typed_text, ANSWER_SIZE, WHITE, 160, HEIGHT - 90, center=False)
 
     def _draw_result(self, screen):
         gs = self.game_state
 
-        draw_text(screen, "결과", self.title_font, WHITE, WIDTH//2, 80)
-        draw_text(screen, f"총 문제: {gs.total_questions}", self.menu_font, WHITE, WIDTH//2, 160)
-        draw_text(screen, f"맞음: {gs.correct_count}", self.menu_font, GREEN, WIDTH//2, 200)
-        draw_text(screen, f"틀림: {gs.wrong_count}", self.menu_font, RED, WIDTH//2, 240)
+        draw_text(screen, "결과", TITLE_SIZE, WHITE, WIDTH//2, 80)
+        draw_text(screen, f"총 문제: {gs.total_questions}", MENU_SIZE, WHITE, WIDTH//2, 160)
+        draw_text(screen, f"맞음: {gs.correct_count}", MENU_SIZE, GREEN, WIDTH//2, 200)
+        draw_text(screen, f"틀림: {gs.wrong_count}", MENU_SIZE, RED, WIDTH//2, 240)
 
-        draw_text(screen, "틀린 단어 목록", self.small_font, WHITE, WIDTH//2, 300)
+        draw_text(screen, "틀린 단어 목록", SMALL_SIZE, WHITE, WIDTH//2, 300)
 
         y = 330
         for item in gs.wrong_list[:5]:
             line = f"{item['word']} | 정답: {item['meaning']} | 입력: {item['user_answer']}"
-            draw_text(screen, line, self.small_font, WHITE, WIDTH//2, y)
+            draw_text(screen, line, SMALL_SIZE, WHITE, WIDTH//2, y)
             y += 26
 
-        draw_text(screen, "[SPACE] 다시 하기", self.small_font, BLUE, WIDTH//2, HEIGHT - 40)
+        draw_text(screen, "[SPACE] 다시 하기", SMALL_SIZE, BLUE, WIDTH//2, HEIGHT - 40)
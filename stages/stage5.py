@@ -2,10 +2,14 @@ import pygame
 import sys
 import os
 import time
+import hashlib
+import threading
 import numpy as np
 import librosa
+import soundfile
 
 from core.button import Button
+from core.text import render_text
 from core.config import SCREEN_WIDTH, SCREEN_HEIGHT
 
 # -------------------------------------------------------
@@ -17,6 +21,20 @@ PROJECT_ROOT = os.path.dirname(BASE_DIR)
 AUDIO_DIR = os.path.join(PROJECT_ROOT, "assets", "audio")
 ASSET_DIR = os.path.join(PROJECT_ROOT, "assets")       
 SONG_PATH = os.path.join(AUDIO_DIR, "song.wav")
+BEAT_CACHE_DIR = os.path.join(PROJECT_ROOT, "data", "beat_cache")
+
+# 이 크기보다 큰 오디오 파일은 통째로 읽지 않고 블록 단위로 분석
+STREAM_THRESHOLD = 64 * 1024 * 1024
+
+# 차트 생성 설정
+LANES = 4
+NOTE_DENSITY = 3.0     # 목표 초당 노트 수
+MIN_LANE_GAP = 0.1     # 같은 레인 노트 사이 최소 간격 (초)
+THIN_WINDOW = 1.0      # 밀도를 맞추는 구간 길이 (초)
+N_MELS = 128
+# 차트 생성 방식(N_MELS, MIN_LANE_GAP, THIN_WINDOW, 레인 배정 등)을 바꾸면 올린다.
+# 버전이 다른 차트 파일은 읽지 않고 다시 만든다.
+CHART_VERSION = 1
 
 # -------------------------------------------------------
 # 화면 설정
@@ -35,97 +53,375 @@ YELLOW = (250, 220, 50)
 
 
 # -------------------------------------------------------
-# Note 클래스
+# Chart 클래스 : 노트를 정렬된 NumPy 배열로 보관하고
+# head 커서 이후의 보이는/판정 가능한 노트만 다룬다
 # -------------------------------------------------------
-class Note:
-    def __init__(self, target_time, spawn_time, x, y_start, y_hit, speed):
-        self.target_time = target_time
-        self.spawn_time = spawn_time
-        self.x = x
-        self.y = y_start
+class Chart:
+    NOTE_W = 80
+    NOTE_H = 25
+
+    def __init__(self, beat_times, lanes, lane_x, y_start, y_hit, travel_time):
+        order = np.argsort(np.asarray(beat_times, dtype=float), kind="stable")
+        self.target = np.asarray(beat_times, dtype=float)[order]
+        self.lanes = np.asarray(lanes, dtype=int)[order]
+        self.spawn = np.maximum(self.target - travel_time, 0)
+        self.lane_x = lane_x
         self.y_start = y_start
         self.y_hit = y_hit
-        self.speed = speed
-        self.active = False
-        self.judged = False
+        self.speed = (y_hit - y_start) / travel_time
+        self.reset()
+
+    def __len__(self):
+        return len(self.target)
+
+    def reset(self):
+        self.judged = np.zeros(len(self.target), dtype=bool)
+        self.head = 0  # 이 앞의 노트는 모두 판정(또는 MISS) 완료
+
+    def note_y(self, i, song_time):
+        return self.y_start + self.speed * (song_time - self.spawn[i])
 
     def update(self, song_time):
-        if self.judged:
-            return
+        # 판정선을 지나간 노트를 MISS 처리하고 커서를 민다 (새로 놓친 노트 수 반환)
+        missed = 0
+        while self.head < len(self.target):
+            i = self.head
+            if not self.judged[i]:
+                if song_time < self.spawn[i] or self.note_y(i, song_time) <= self.y_hit + 80:
+                    break
+                self.judged[i] = True
+                missed += 1
+            self.head += 1
+        return missed
+
+    def visible(self, song_time):
+        end = np.searchsorted(self.spawn, song_time, side="right")
+        return [i for i in range(self.head, end) if not self.judged[i]]
+
+    def find_candidate(self, song_time, lookahead=0.5, lane=None):
+        # target 이 song_time + lookahead 이하인 미판정 노트 중 가장 가까운 것 (lane 지정 시 그 레인만)
+        end = np.searchsorted(self.target, song_time + lookahead, side="right")
+        idx = np.arange(self.head, end)
+        idx = idx[~self.judged[idx]]
+        if lane is not None:
+            idx = idx[self.lanes[idx] == lane]
+        if len(idx) == 0:
+            return None, None
+
+        deltas = np.abs(song_time - self.target[idx])
+        k = int(deltas.argmin())
+        return int(idx[k]), float(deltas[k])
+
+    def draw(self, screen, song_time):
+        for i in self.visible(song_time):
+            rect = pygame.Rect(0, 0, self.NOTE_W, self.NOTE_H)
+            rect.center = (self.lane_x[self.lanes[i]], int(self.note_y(i, song_time)))
+            pygame.draw.rect(screen, BLUE, rect, border_radius=6)
+            pygame.draw.rect(screen, WHITE, rect, 2, border_radius=6)
 
-        if not self.active:
-            if song_time >= self.spawn_time:
-                self.active = True
+
+# -------------------------------------------------------
+# SongClock : mixer 의 실제 재생 위치(get_pos)를 따라가는 곡 시계
+# get_pos 는 오디오 버퍼 단위로만 갱신되므로 벽시계로 보간하고,
+# 새 위치가 들어올 때마다 오차를 조금씩 보정한다 (크게 어긋나면 바로 맞춤).
+# -------------------------------------------------------
+class SongClock:
+    def __init__(self, latency=0.0, gain=0.1, snap=0.1):
+        self.latency = latency  # 출력 지연 보정값 (초)
+        self.gain = gain
+        self.snap = snap
+        self.start()
+
+    def start(self):
+        self.start_wall = time.perf_counter()
+        self.offset = 0.0  # 오디오 위치 - 벽시계 경과 시간
+        self.last_pos = None
+        self.last_time = 0.0
+
+    def mixer_pos(self):
+        try:
+            ms = pygame.mixer.music.get_pos()
+        except pygame.error:
+            return None
+        return ms / 1000 if ms >= 0 else None
+
+    def now(self):
+        wall = time.perf_counter() - self.start_wall
+        pos = self.mixer_pos()
+        if pos is not None and pos != self.last_pos:
+            self.last_pos = pos
+            error = pos - (wall + self.offset)
+            if abs(error) > self.snap:
+                self.offset += error
             else:
-                return
+                self.offset += error * self.gain
 
-        dt = song_time - self.spawn_time
-        self.y = self.y_start + self.speed * dt
+        # 프레임 사이에 시간이 뒤로 가지 않도록
+        t = max(wall + self.offset, self.last_time)
+        self.last_time = t
+        return t - self.latency
 
-        if self.y > self.y_hit + 80:
-            self.judged = True
 
-    def draw(self, screen):
-        if not self.active or self.judged:
-            return
+# -------------------------------------------------------
+# 블록 단위 onset 세기 계산 (긴 곡도 메모리 사용량 일정)
+# librosa.onset.onset_strength(y=librosa.load(sr=None)) 와 같은 값이 나오도록
+# 앞뒤에 n_fft // 2 만큼 0 을 붙여 center=True 프레임을 재현하고,
+# power_to_db 의 top_db(전체 최댓값 기준) 때문에 두 번 읽는다.
+# -------------------------------------------------------
+def stream_mel_blocks(audio_path, n_fft=2048, hop_length=512, block_frames=512):
+    with soundfile.SoundFile(audio_path) as f:
+        sr = f.samplerate
+        pad = np.zeros(n_fft // 2, dtype=np.float32)
+        buf = pad
+        done = False
+
+        while not done:
+            block = f.read(block_frames * hop_length, dtype="float32", always_2d=True)
+            if len(block) == 0:
+                buf = np.concatenate((buf, pad))
+                done = True
+            else:
+                buf = np.concatenate((buf, block.mean(axis=1)))
+
+            if len(buf) < n_fft:
+                continue
+            n_frames = 1 + (len(buf) - n_fft) // hop_length
+            used = buf[:n_fft + (n_frames - 1) * hop_length]
+
+            power = np.abs(librosa.stft(used, n_fft=n_fft, hop_length=hop_length, center=False)) ** 2
+            yield sr, f.tell() / max(f.frames, 1), librosa.feature.melspectrogram(S=power, sr=sr, n_fft=n_fft)
+            buf = buf[n_frames * hop_length:]
+
+
+def stream_onset_strength(audio_path, aggregate=np.mean, channels=None, progress=None,
+                          n_fft=2048, hop_length=512):
+    # channels : mel 대역 경계 목록 (onset_strength_multi 와 같음). 주면 (대역 수, 프레임) 배열을 돌려준다
+    progress = progress or (lambda value, message: None)
+
+    # 1차 : dB 변환 기준이 되는 전체 최댓값
+    peak = 0.0
+    for sr, done, mel in stream_mel_blocks(audio_path, n_fft, hop_length):
+        peak = max(peak, float(mel.max()))
+        progress(0.1 + 0.35 * done, "오디오 분석 중 (1/2)...")
+    floor_db = 10.0 * np.log10(max(1e-10, peak)) - 80.0
+
+    # 2차 : 이전 블록의 마지막 프레임을 이어 붙여 프레임 차분
+    parts = []
+    prev = None
+    n_total = 0
+    for sr, done, mel in stream_mel_blocks(audio_path, n_fft, hop_length):
+        S = np.maximum(librosa.power_to_db(mel, top_db=None), floor_db)
+        n_total += S.shape[1]
+        if prev is not None:
+            S = np.concatenate((prev, S), axis=1)
+        prev = S[:, -1:]
+        diff = np.maximum(0.0, S[:, 1:] - S[:, :-1])
+        if channels is None:
+            parts.append(aggregate(diff, axis=0))
+        else:
+            parts.append(np.stack([aggregate(diff[a:b], axis=0) for a, b in zip(channels[:-1], channels[1:])]))
+        progress(0.45 + 0.35 * done, "오디오 분석 중 (2/2)...")
+
+    # lag(1) + 프레이밍 보정(n_fft // (2 * hop)) 만큼 앞을 채우고 길이를 맞춘다
+    pad_width = 1 + n_fft // (2 * hop_length)
+    zeros = np.zeros(parts[0].shape[:-1] + (pad_width,), dtype=np.float32)
+    onset_env = np.concatenate([zeros] + parts, axis=-1)[..., :n_total]
+    print(f"SampleRate={sr}, Length={n_total * hop_length / sr:.2f}s (stream)")
+    return onset_env, sr
+
+
+# -------------------------------------------------------
+# Beat 분석 캐시 (파일 내용 해시 + 분석 옵션 기준)
+# -------------------------------------------------------
+def file_digest(path, chunk_size=1 << 20):
+    h = hashlib.sha256()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(chunk_size), b""):
+            h.update(chunk)
+    return h.hexdigest()
+
+
+def chart_cache_path(digest, lanes, density):
+    # digest : file_digest(오디오 경로). 긴 파일은 해시에 시간이 걸리므로 한 번 구해서 같이 쓴다
+    return os.path.join(BEAT_CACHE_DIR, f"{digest}_chart_{lanes}_{density:g}.npz")
 
-        width = 80
-        height = 25
-        rect = pygame.Rect(0, 0, width, height)
-        rect.center = (self.x, int(self.y))
-        pygame.draw.rect(screen, BLUE, rect, border_radius=6)
-        pygame.draw.rect(screen, WHITE, rect, 2, border_radius=6)
+
+def chart_path_for(audio_path):
+    # 오프라인으로 미리 만든 차트 : 오디오 파일 옆의 <이름>.chart.npz
+    return os.path.splitext(audio_path)[0] + ".chart.npz"
 
 
 # -------------------------------------------------------
-# Beat 추출 (librosa)
+# 차트 생성 : onset 세기 -> 대역 에너지로 레인 배정 -> 밀도에 맞춰 솎아내기
 # -------------------------------------------------------
-def extract_beats(audio_path, max_beats=80, mode="onset"):
+def onset_bands(audio_path, n_bands, progress=None, stream=None):
+    if stream is None:
+        stream = os.path.getsize(audio_path) > STREAM_THRESHOLD
+
+    edges = [int(e) for e in np.linspace(0, N_MELS, n_bands + 1)]
+    if stream:
+        band_env, sr = stream_onset_strength(audio_path, channels=edges, progress=progress)
+    else:
+        y, sr = librosa.load(audio_path, sr=None)
+        S = librosa.power_to_db(librosa.feature.melspectrogram(y=y, sr=sr, n_mels=N_MELS))
+        band_env = librosa.onset.onset_strength_multi(S=S, sr=sr, channels=edges)
+    return band_env, np.diff(edges), sr
+
+
+def thin_by_density(times, strength, density, window=THIN_WINDOW):
+    # window 초 구간마다 가장 센 노트를 density * window 개까지만 남긴다
+    per_window = max(1, int(round(density * window)))
+    bucket = np.floor(times / window).astype(int)
+    order = np.lexsort((-strength, bucket))
+    sorted_bucket = bucket[order]
+    rank = np.arange(len(order)) - np.searchsorted(sorted_bucket, sorted_bucket, side="left")
+
+    keep = np.zeros(len(times), dtype=bool)
+    keep[order[rank < per_window]] = True
+    return keep
+
+
+def drop_lane_collisions(times, lanes, min_gap=MIN_LANE_GAP):
+    keep = np.ones(len(times), dtype=bool)
+    last = {}
+    for i in np.argsort(times, kind="stable"):
+        lane = lanes[i]
+        if lane in last and times[i] - last[lane] < min_gap:
+            keep[i] = False
+        else:
+            last[lane] = times[i]
+    return keep
+
+
+def generate_chart(audio_path, lanes=LANES, density=NOTE_DENSITY, progress=None, stream=None):
+    progress = progress or (lambda value, message: None)
     if not os.path.exists(audio_path):
         raise FileNotFoundError(f"오디오 파일 없음: {audio_path}")
 
-    print("오디오 로딩:", audio_path)
-    y, sr = librosa.load(audio_path, sr=None)
-    print(f"SampleRate={sr}, Length={len(y)/sr:.2f}s")
+    print("차트 생성:", audio_path)
+    progress(0.1, "오디오 로딩 중...")
+    band_env, sizes, sr = onset_bands(audio_path, lanes, progress=progress, stream=stream)
+    progress(0.8, "노트 배치 중...")
 
-    if mode == "beat":
-        tempo, beat_frames = librosa.beat.beat_track(y=y, sr=sr)
-        if isinstance(tempo, (list, np.ndarray)):
-            tempo_val = float(tempo[0])
-        else:
-            tempo_val = float(tempo)
-        print(f"[BEAT] BPM={tempo_val:.1f}")
-        times = librosa.frames_to_time(beat_frames, sr=sr)
-    else:
-        onset_env = librosa.onset.onset_strength(y=y, sr=sr)
-        onset_frames = librosa.onset.onset_detect(
-            onset_envelope=onset_env,
-            sr=sr,
-            backtrack=True
-        )
-        times = librosa.frames_to_time(onset_frames, sr=sr)
-        print(f"[ONSET] 검출 타격 수: {len(times)}")
+    # 전체 대역 onset 세기 (대역 평균을 mel 개수로 가중 평균)
+    onset_env = (band_env * sizes[:, None]).sum(axis=0) / sizes.sum()
+    peaks = librosa.onset.onset_detect(onset_envelope=onset_env, sr=sr)
+    if len(peaks) == 0:
+        return np.zeros(0), np.zeros(0, dtype=int)
+
+    times = librosa.frames_to_time(librosa.onset.onset_backtrack(peaks, onset_env), sr=sr)
+    strength = onset_env[peaks]
+
+    # 대역마다 최댓값으로 정규화해서 저음 대역만 레인을 독차지하지 않게 한다
+    norm = band_env / np.maximum(band_env.max(axis=1, keepdims=True), 1e-10)
+    lane_idx = norm[:, peaks].argmax(axis=0)
+
+    keep = thin_by_density(times, strength, density)
+    times, lane_idx = times[keep], lane_idx[keep]
+    keep = drop_lane_collisions(times, lane_idx)
+    times, lane_idx = times[keep], lane_idx[keep]
+
+    print(f"[CHART] 검출 {len(peaks)} -> 노트 {len(times)} ({lanes} 레인)")
+    progress(1.0, "완료")
+    return times, lane_idx
+
+
+# -------------------------------------------------------
+# 차트 파일 (ms 단위 uint32 시간 + uint8 레인)
+# -------------------------------------------------------
+def save_chart(path, times, lane_idx, lanes):
+    # 임시 파일에 쓴 뒤 교체해서 중간에 끊겨도 깨진 파일이 남지 않게 한다
+    tmp_path = path[:-len(".npz")] + ".tmp.npz"
+    np.savez_compressed(
+        tmp_path,
+        version=CHART_VERSION,
+        lanes=lanes,
+        times_ms=np.round(np.asarray(times) * 1000).astype(np.uint32),
+        lane_idx=np.asarray(lane_idx).astype(np.uint8),
+    )
+    os.replace(tmp_path, path)
+
+
+def read_chart(path):
+    # 다른 버전으로 만든 차트면 None
+    with np.load(path) as z:
+        if "version" not in z or int(z["version"]) != CHART_VERSION:
+            return None
+        return z["times_ms"] / 1000.0, z["lane_idx"].astype(int), int(z["lanes"])
+
+
+def find_chart(path, progress=None):
+    if not os.path.exists(path):
+        return None
+    chart = read_chart(path)
+    if chart is None:
+        print("[경고] 차트 버전이 달라 무시:", path)
+        return None
+    print("차트 사용:", path)
+    if progress:
+        progress(1.0, "완료")
+    return chart
+
+
+def load_chart(audio_path, lanes=LANES, density=NOTE_DENSITY, progress=None):
+    if not os.path.exists(audio_path):
+        raise FileNotFoundError(f"오디오 파일 없음: {audio_path}")
+
+    # 오프라인 차트가 있으면 오디오 파일을 해시하지 않고 바로 쓴다
+    chart = find_chart(chart_path_for(audio_path), progress)
+    if chart is not None:
+        return chart
 
-    # 너무 많으면 2개 중 1개만 사용
-    times = times[::2]
+    cache_path = chart_cache_path(file_digest(audio_path), lanes, density)
+    chart = find_chart(cache_path, progress)
+    if chart is not None:
+        return chart
 
-    if len(times) > max_beats:
-        times = times[:max_beats]
+    times, lane_idx = generate_chart(audio_path, lanes, density, progress=progress)
 
-    print("사용할 노트 수:", len(times))
-    return times
+    os.makedirs(BEAT_CACHE_DIR, exist_ok=True)
+    save_chart(cache_path, times, lane_idx, lanes)
+    return times, lane_idx, lanes
+
+
+# -------------------------------------------------------
+# 백그라운드 Beat 분석 (게임 루프를 막지 않도록 스레드에서 실행)
+# -------------------------------------------------------
+class BeatAnalysis:
+    def __init__(self, audio_path, lanes=LANES, density=NOTE_DENSITY):
+        self.audio_path = audio_path
+        self.lanes = lanes
+        self.density = density
+
+        self.progress = 0.0
+        self.message = "비트 분석 중..."
+        self.result = None
+        self.error = None
+        self.done = False
+
+        self.thread = threading.Thread(target=self.run, daemon=True)
+        self.thread.start()
+
+    def report(self, value, message):
+        self.progress = value
+        self.message = message
+
+    def run(self):
+        try:
+            self.result = load_chart(self.audio_path, self.lanes, self.density, progress=self.report)
+        except Exception as e:
+            self.error = str(e)
+        self.done = True
 
 
 # -------------------------------------------------------
 # Font util
 # -------------------------------------------------------
-def load_font(size):
-    return pygame.font.SysFont("malgungothic", size)
+FONT_NAME = "malgungothic"
 
 
 def draw_text_center(surface, text, size, color, y):
-    font = load_font(size)
-    img = font.render(text, True, color)
+    img = render_text(text, size, color, FONT_NAME)
     rect = img.get_rect(center=(WIDTH // 2, y))
     surface.blit(img, rect)
 
@@ -133,9 +429,14 @@ def draw_text_center(surface, text, size, color, y):
 # -------------------------------------------------------
 # Stage5 Scene 클래스
 # -------------------------------------------------------
+LANE_W = 100
+LANE_KEYS = (pygame.K_s, pygame.K_d, pygame.K_f, pygame.K_j, pygame.K_k, pygame.K_l)
+
+
 class Stage5:
-    def __init__(self, engine):
+    def __init__(self, engine, song_path=SONG_PATH):
         self.engine = engine
+        self.song_path = song_path
 
         # Back 버튼
         self.back_btn = Button(15, 15, 60, 40, "Back", 20, self.back_to_menu)
@@ -143,9 +444,10 @@ class Stage5:
         # 로딩 중 표시용 플래그
         self.loading = True
         self.error_message = ""
-        self.notes = []
+        self.chart = None
         self.playing = False
-        self.start_time = None
+        self.clock = SongClock()
+        self.song_time = None  # 마지막 update 시점의 곡 위치 (노트 그리기에 사용)
 
         # 판정
         self.HIT_WINDOWS = {
@@ -160,21 +462,38 @@ class Stage5:
         self.combo = 0
         self.max_combo = 0
 
-        # 먼저 비트 분석 시도
-        try:
-            self.beat_times = extract_beats(SONG_PATH)
-            self.setup_notes()
-        except Exception as e:
-            self.error_message = str(e)
+        # 지연 보정 모드 : 노트에 맞춰 누른 시간 차이를 모아 clock.latency 에 반영
+        self.calibrating = False
+        self.calibration_samples = []
+        self.CALIBRATION_TAPS = 8
 
-        self.loading = False
+        # 비트 분석은 백그라운드에서 진행 (update 에서 완료 확인)
+        self.beat_times = []
+        self.note_lanes = []
+        self.lanes = LANES
+        self.lane_keys = {}
+        self.analysis = BeatAnalysis(song_path)
+
+    def reset(self):
+        # 장면을 다시 열 때 : 분석 결과(차트)와 지연 보정값은 유지하고 플레이 상태만 초기화
+        if self.playing:
+            pygame.mixer.music.stop()
+        self.playing = False
+        self.song_time = None
+        self.calibrating = False
+        self.calibration_samples = []
+        self.score = 0
+        self.combo = 0
+        self.max_combo = 0
+        self.last_judge_text = ""
+        if self.chart is not None:
+            self.chart.reset()
 
     # ---------------------------------------------------
     # Back 버튼 기능
     # ---------------------------------------------------
     def back_to_menu(self):
-        from .select import StageSelectScreen
-        self.engine.change_scene(StageSelectScreen(self.engine))
+        self.engine.show("select")
 
     # ---------------------------------------------------
     # 노트 구성
@@ -183,17 +502,13 @@ class Stage5:
         y_start = -40
         y_hit = HEIGHT - 120
         travel_time = 1.2
-        speed = (y_hit - y_start) / travel_time
-        x_lane = WIDTH // 2
-
-        self.notes = []
-        for t in self.beat_times:
-            spawn_time = t - travel_time
-            if spawn_time < 0:
-                spawn_time = 0
-            self.notes.append(
-                Note(t, spawn_time, x_lane, y_start, y_hit, speed)
-            )
+
+        # 레인을 화면 가운데에 나란히 배치, 키는 s d f j k l 중 가운데부터
+        self.lane_x = [WIDTH // 2 + int((i - (self.lanes - 1) / 2) * LANE_W) for i in range(self.lanes)]
+        first = max(0, (len(LANE_KEYS) - self.lanes) // 2)
+        self.lane_keys = {key: lane for lane, key in enumerate(LANE_KEYS[first:first + self.lanes])}
+
+        self.chart = Chart(self.beat_times, self.note_lanes, self.lane_x, y_start, y_hit, travel_time)
 
     # ---------------------------------------------------
     # Pygame Event
@@ -204,10 +519,19 @@ class Stage5:
         if event.type == pygame.KEYDOWN:
             if event.key == pygame.K_SPACE:
                 # 판정 or 곡 시작
+                if self.loading or self.error_message:
+                    return
                 if not self.playing:
                     self.start_song()
+                elif self.calibrating:
+                    self.calibrate_tap()
                 else:
                     self.try_judge()
+            elif event.key in self.lane_keys and self.playing and not self.calibrating:
+                self.try_judge(self.lane_keys[event.key])
+            elif event.key == pygame.K_c and not self.loading:
+                self.calibrating = not self.calibrating
+                self.calibration_samples = []
             elif event.key == pygame.K_ESCAPE:
                 self.back_to_menu()
 
@@ -215,14 +539,14 @@ class Stage5:
     # 곡 시작
     # ---------------------------------------------------
     def start_song(self):
-        if not os.path.exists(SONG_PATH):
-            self.error_message = f"오디오 파일 없음: {SONG_PATH}"
+        if not os.path.exists(self.song_path):
+            self.error_message = f"오디오 파일 없음: {self.song_path}"
             return
 
-        pygame.mixer.music.load(SONG_PATH)
+        pygame.mixer.music.load(self.song_path)
         pygame.mixer.music.play()
         self.playing = True
-        self.start_time = time.time()
+        self.clock.start()
 
         # 초기화
         self.score = 0
@@ -231,32 +555,19 @@ class Stage5:
         self.last_judge_text = ""
 
         # 노트 상태 초기화
-        for n in self.notes:
-            n.judged = False
-            n.active = False
-            n.y = n.y_start
+        self.chart.reset()
+        self.song_time = None
 
     # ---------------------------------------------------
     # 판정
     # ---------------------------------------------------
-    def try_judge(self):
+    def try_judge(self, lane=None):
         if not self.playing:
             return
 
-        song_time = time.time() - self.start_time
+        song_time = self.clock.now()
 
-        cand = None
-        best_delta = 999
-        for note in self.notes:
-            if note.judged:
-                continue
-            if note.target_time - song_time > 0.5:
-                continue
-
-            delta = abs(song_time - note.target_time)
-            if delta < best_delta:
-                best_delta = delta
-                cand = note
+        cand, best_delta = self.chart.find_candidate(song_time, lane=lane)
 
         if cand is None:
             self.judge_result("MISS", RED, 0)
@@ -264,16 +575,33 @@ class Stage5:
 
         if best_delta <= self.HIT_WINDOWS["PERFECT"]:
             self.judge_result("PERFECT", YELLOW, 300)
-            cand.judged = True
+            self.chart.judged[cand] = True
         elif best_delta <= self.HIT_WINDOWS["GREAT"]:
             self.judge_result("GREAT", GREEN, 200)
-            cand.judged = True
+            self.chart.judged[cand] = True
         elif best_delta <= self.HIT_WINDOWS["GOOD"]:
             self.judge_result("GOOD", BLUE, 100)
-            cand.judged = True
+            self.chart.judged[cand] = True
         else:
             self.judge_result("MISS", RED, 0)
 
+    def calibrate_tap(self):
+        song_time = self.clock.now()
+        cand, delta = self.chart.find_candidate(song_time)
+        if cand is None or delta > 0.3:
+            return
+
+        self.chart.judged[cand] = True
+        self.calibration_samples.append(song_time - self.chart.target[cand])
+
+        if len(self.calibration_samples) >= self.CALIBRATION_TAPS:
+            self.clock.latency += float(np.median(self.calibration_samples))
+            self.calibration_samples = []
+            self.calibrating = False
+            self.last_judge_text = f"지연 보정: {self.clock.latency * 1000:.0f}ms"
+            self.last_judge_color = WHITE
+            self.last_judge_time = time.time()
+
     def judge_result(self, text, color, add_score):
         if text == "MISS":
             self.combo = 0
@@ -290,23 +618,36 @@ class Stage5:
     # Update
     # ---------------------------------------------------
     def update(self):
-        if self.loading or self.error_message:
+        if self.loading:
+            self.check_analysis()
+            return
+
+        if self.error_message:
             return
 
         if self.playing:
-            song_time = time.time() - self.start_time
+            song_time = self.clock.now()
+            self.song_time = song_time
 
-            # 노트 업데이트
-            for note in self.notes:
-                before = note.judged
-                note.update(song_time)
-                if not before and note.judged and note.y > note.y_hit + 80:
-                    self.judge_result("MISS", RED, 0)
+            # 판정선을 지나간 노트 MISS 처리
+            for _ in range(self.chart.update(song_time)):
+                self.judge_result("MISS", RED, 0)
 
             # 곡 종료 체크
             if not pygame.mixer.music.get_busy():
                 self.playing = False
 
+    def check_analysis(self):
+        if not self.analysis.done:
+            return
+
+        if self.analysis.error:
+            self.error_message = self.analysis.error
+        else:
+            self.beat_times, self.note_lanes, self.lanes = self.analysis.result
+            self.setup_notes()
+        self.loading = False
+
     # ---------------------------------------------------
     # Draw
     # ---------------------------------------------------
@@ -315,7 +656,14 @@ class Stage5:
         self.back_btn.draw(screen)
 
         if self.loading:
-            draw_text_center(screen, "비트 분석 중...", 40, WHITE, HEIGHT // 2)
+            draw_text_center(screen, self.analysis.message, 40, WHITE, HEIGHT // 2)
+
+            # 진행 막대
+            bar = pygame.Rect(WIDTH // 2 - 150, HEIGHT // 2 + 40, 300, 16)
+            pygame.draw.rect(screen, GRAY, bar, 2, border_radius=4)
+            fill = bar.inflate(-4, -4)
+            fill.width = int(fill.width * self.analysis.progress)
+            pygame.draw.rect(screen, BLUE, fill, border_radius=4)
             return
 
         if self.error_message:
@@ -324,23 +672,45 @@ class Stage5:
 
         # 판정선
         pygame.draw.line(screen, GRAY, (0, HEIGHT - 120), (WIDTH, HEIGHT - 120), 3)
-        pygame.draw.rect(screen, GRAY, (WIDTH//2 - 60, HEIGHT - 140, 120, 40), 2, border_radius=8)
-        draw_text_center(screen, "HIT", 24, GRAY, HEIGHT - 120)
+        key_names = {lane: pygame.key.name(key).upper() for key, lane in self.lane_keys.items()}
+        for lane, x in enumerate(self.lane_x):
+            box = pygame.Rect(x - LANE_W // 2 + 5, HEIGHT - 140, LANE_W - 10, 40)
+            pygame.draw.rect(screen, GRAY, box, 2, border_radius=8)
+            label = render_text(key_names.get(lane, ""), 20, GRAY, FONT_NAME)
+            screen.blit(label, label.get_rect(center=box.center))
 
         # 노트 표시
-        for note in self.notes:
-            note.draw(screen)
+        if self.song_time is not None:
+            self.chart.draw(screen, self.song_time)
 
         # 점수
-        font = load_font(24)
-        screen.blit(font.render(f"Score: {self.score}", True, WHITE), (20, 50))
-        screen.blit(font.render(f"Combo: {self.combo}", True, WHITE), (20, 80))
-        screen.blit(font.render(f"Max Combo: {self.max_combo}", True, WHITE), (20, 110))
+        screen.blit(render_text(f"Score: {self.score}", 24, WHITE, FONT_NAME), (20, 50))
+        screen.blit(render_text(f"Combo: {self.combo}", 24, WHITE, FONT_NAME), (20, 80))
+        screen.blit(render_text(f"Max Combo: {self.max_combo}", 24, WHITE, FONT_NAME), (20, 110))
 
         # 판정 텍스트
         if self.last_judge_text and (time.time() - self.last_judge_time) < 1.0:
             draw_text_center(screen, self.last_judge_text, 36, self.last_judge_color, HEIGHT // 2)
 
+        # 지연 보정 모드
+        if self.calibrating:
+            draw_text_center(screen, f"지연 보정 중 {len(self.calibration_samples)}/{self.CALIBRATION_TAPS} (C: 취소)",
+                             22, YELLOW, 150)
+
         # 곡이 끝났을 때
         if not self.playing:
-            draw_text_center(screen, "SPACE: 다시 플레이 | ESC: 뒤로가기", 22, GRAY, HEIGHT - 40)
+            draw_text_center(screen, "SPACE: 다시 플레이 | C: 지연 보정 | ESC: 뒤로가기", 22, GRAY, HEIGHT - 40)
+
+
+# -------------------------------------------------------
+# 오프라인 차트 생성 : python -m stages.stage5 <오디오 파일> [레인 수] [초당 노트 수]
+# -------------------------------------------------------
+if __name__ == "__main__":
+    audio = sys.argv[1] if len(sys.argv) > 1 else SONG_PATH
+    lanes = int(sys.argv[2]) if len(sys.argv) > 2 else LANES
+    density = float(sys.argv[3]) if len(sys.argv) > 3 else NOTE_DENSITY
+
+    times, lane_idx = generate_chart(audio, lanes, density)
+    out = chart_path_for(audio)
+    save_chart(out, times, lane_idx, lanes)
+    print("차트 저장:", out, len(times))
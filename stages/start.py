@@ -1,28 +1,28 @@
 import pygame
-from core.button import Button
+from core.button import Button, ButtonGroup
 
 class StartScreen:
     def __init__(self, engine):
         self.engine = engine
         self.start_button = Button(300, 380, 200, 60, "Start", 40, self.start_game)
         self.end_button = Button(300, 460, 200, 60, "End", 40, self.end_game)
+        self.buttons = ButtonGroup([self.start_button, self.end_button])
+        self.dirty = True  # 다시 그려야 할 때만 True (엔진이 그린 뒤 끔)
 
     def start_game(self):
-        from .select import StageSelectScreen
-        self.engine.change_scene(StageSelectScreen(self.engine))
+        self.engine.show("select")
 
     def end_game(self):
-        pygame.quit()
-        exit()
+        # 창을 닫을 때와 같은 경로로 끝낸다 (엔진이 프로파일 저장, 장면 정리 후 종료)
+        pygame.event.post(pygame.event.Event(pygame.QUIT))
 
     def update(self):
         pass
 
     def draw(self, screen):
         screen.fill((50, 50, 50))
-        self.start_button.draw(screen)
-        self.end_button.draw(screen)
+        self.buttons.draw(screen)
 
     def handle_event(self, event):
-        self.start_button.handle_event(event)
-        self.end_button.handle_event(event)
+        if self.buttons.handle_event(event):
+            self.dirty = True